@@ -1,50 +1,88 @@
-from typing import List, Tuple, Dict
-from .geometry import Room
+from bisect import bisect_left
+from itertools import accumulate
+from typing import List, Tuple, Dict, Sequence
+import numpy as np
+from .geometry import Room, rect_clip_aabb
+
+# Unit box template: corner offsets (scaled by w, h, d) and quad faces (0-based local indices)
+_BOX_CORNERS = np.array([
+    # Bottom
+    (0, 0, 0), (1, 0, 0), (1, 0, 1), (0, 0, 1),
+    # Top
+    (0, 1, 0), (1, 1, 0), (1, 1, 1), (0, 1, 1),
+], dtype=np.float64)
+_BOX_FACES = np.array([
+    (0, 1, 5, 4),  # Front
+    (2, 3, 7, 6),  # Back
+    (3, 0, 4, 7),  # Left
+    (1, 2, 6, 5),  # Right
+    (4, 5, 6, 7),  # Top
+    (3, 2, 1, 0),  # Bottom
+], dtype=np.int32)
 
 class OBJGenerator:
-    def __init__(self):
-        self.vertices = []
+    def __init__(self, capacity: int = 4096):
+        # Contiguous preallocated buffers, grown by doubling (amortized O(1) appends)
+        self._vertices = np.empty((capacity, 3), dtype=np.float64)
+        self._faces = np.empty((capacity, 4), dtype=np.int32) # quads of vertex indices (1-based)
+        self._v_n = 0
+        self._f_n = 0
+        # Non-quad faces as (quad count when added, indices) - written in insertion order
+        self._polygons: List[Tuple[int, Tuple[int, ...]]] = []
         self.normals = [] # Not strictly needed for basic geo but good
-        self.faces = [] # list of lists of vertex indices (1-based)
+        
+    @property
+    def vertices(self) -> np.ndarray:
+        return self._vertices[:self._v_n]
+        
+    @property
+    def faces(self) -> np.ndarray:
+        """Quad faces only - triangles / n-gons from add_face are kept in their own list."""
+        return self._faces[:self._f_n]
+        
+    def _reserve(self, n_vertices: int, n_faces: int):
+        """Grow the buffers so that the given number of extra rows fits."""
+        need = self._v_n + n_vertices
+        if need > len(self._vertices):
+            grown = np.empty((max(need, 2 * len(self._vertices)), 3), dtype=np.float64)
+            grown[:self._v_n] = self._vertices[:self._v_n]
+            self._vertices = grown
+        need = self._f_n + n_faces
+        if need > len(self._faces):
+            grown = np.empty((max(need, 2 * len(self._faces)), 4), dtype=np.int32)
+            grown[:self._f_n] = self._faces[:self._f_n]
+            self._faces = grown
         
     def add_vertex(self, x: float, y: float, z: float) -> int:
-        self.vertices.append((x, y, z))
-        return len(self.vertices)
+        self._reserve(1, 0)
+        self._vertices[self._v_n] = (x, y, z)
+        self._v_n += 1
+        return self._v_n
         
     def add_face(self, indices: List[int]):
-        self.faces.append(indices)
+        """Adds a face from (1-based) vertex indices. Quads go to the buffer, other polygons to a side list."""
+        if len(indices) != 4:
+            self._polygons.append((self._f_n, tuple(indices)))
+            return
+        self._reserve(0, 1)
+        self._faces[self._f_n] = indices
+        self._f_n += 1
         
     def add_box(self, x: float, y: float, z: float, w: float, h: float, d: float):
         """
         Adds a box at (x,y,z) with dimensions (w,h,d).
         (x,y,z) is bottom-front-left corner.
         """
-        # 8 vertices
-        # Bottom
-        v1 = self.add_vertex(x, y, z)
-        v2 = self.add_vertex(x + w, y, z)
-        v3 = self.add_vertex(x + w, y, z + d)
-        v4 = self.add_vertex(x, y, z + d)
+        self._reserve(8, 6)
+        v0 = self._v_n
+        f0 = self._f_n
         
-        # Top
-        v5 = self.add_vertex(x, y + h, z)
-        v6 = self.add_vertex(x + w, y + h, z)
-        v7 = self.add_vertex(x + w, y + h, z + d)
-        v8 = self.add_vertex(x, y + h, z + d)
-        
-        # Faces (CCW winding)
-        # Front
-        self.add_face([v1, v2, v6, v5])
-        # Back
-        self.add_face([v3, v4, v8, v7])
-        # Left
-        self.add_face([v4, v1, v5, v8])
-        # Right
-        self.add_face([v2, v3, v7, v6])
-        # Top
-        self.add_face([v5, v6, v7, v8])
-        # Bottom
-        self.add_face([v4, v3, v2, v1])
+        # 8 vertices and 6 faces (CCW winding) written in one slice each
+        self._vertices[v0:v0 + 8] = _BOX_CORNERS * (w, h, d) + (x, y, z)
+        self._faces[f0:f0 + 6] = _BOX_FACES + (v0 + 1)
+        
+        self._v_n += 8
+        self._f_n += 6
     
     def add_box_rotated_z(self, x: float, y: float, z: float, w: float, h: float, d: float):
         """
@@ -111,49 +149,7 @@ class OBJGenerator:
         # User said "generate_worktop... accept list of cutouts...".
         # For cabinet, let's assume `back_cutouts` are in Local Coords relative to (x, y).
         
-        # Logic to split back panel rect (0, 0, bw, bh)
-        # We need the Subtract method. 
-        
-        def subtract_rects(rects, hole):
-            hx, hy, h_w, h_h = hole
-            new_r = []
-            for rx, ry, rw, rh in rects:
-                # Check overlap
-                if not (hx >= rx + rw or hx + h_w <= rx or hy >= ry + rh or hy + h_h <= ry):
-                    # Overlap - Split
-                     overlap_x1 = max(rx, hx)
-                     overlap_x2 = min(rx + rw, hx + h_w)
-                     
-                     if overlap_x2 > overlap_x1:
-                        # Bottom
-                        if hy > ry:
-                            new_r.append((rx, ry, rw, hy - ry)) 
-                            # Wait, complex split logic for full 4-way?
-                            # To keep it simple and robust (avoid overlaps):
-                            # 1. Box Below Hole (Full width of rect)
-                            # 2. Box Above Hole (Full width of rect)
-                            # 3. Box Left of Hole (Between Y ranges)
-                            # 4. Box Right of Hole (Between Y ranges)
-                            
-                        # Correct logic:
-                        # Top
-                        if hy + h_h < ry + rh:
-                             new_r.append((rx, hy + h_h, rw, (ry + rh) - (hy + h_h)))
-                        # Bottom
-                        if hy > ry:
-                             new_r.append((rx, ry, rw, hy - ry))
-                        # Left (clamped vertical)
-                        # Y range is max(ry, hy) to min(ry+rh, hy+hh)
-                        y_start = max(ry, hy)
-                        y_end = min(ry + rh, hy + h_h)
-                        if y_end > y_start:
-                             if hx > rx:
-                                 new_r.append((rx, y_start, hx - rx, y_end - y_start))
-                             if hx + h_w < rx + rw:
-                                 new_r.append((hx + h_w, y_start, (rx + rw) - (hx + h_w), y_end - y_start))
-                else:
-                    new_r.append((rx, ry, rw, rh))
-            return new_r
+        # Logic to split back panel rect (0, 0, bw, bh) - see rect_clip_aabb
 
         # Start with full back panel (relative to bx, by)
         # Coordinates relative to bx, by
@@ -169,7 +165,8 @@ class OBJGenerator:
                 rel_x = cx - thick
                 rel_y = cy_local - thick
                 
-                curr_rects = subtract_rects(curr_rects, (rel_x, rel_y, cw, ch_local))
+                hole = (rel_x, rel_y, cw, ch_local)
+                curr_rects = [piece for r in curr_rects for piece in rect_clip_aabb(r, hole)]
                 
         # Generate Geometry for rects
         for rx, ry, rw, rh in curr_rects:
@@ -1030,79 +1027,19 @@ class OBJGenerator:
         # We generate "Shell" which is Outside the room volume?
         # Or Just boundary planes.
         
+        # Group windows/doors by wall once
+        feats_by_wall = {}
+        for f in (room.windows or []) + (room.doors or []):
+            feats_by_wall.setdefault(f.get('wall'), []).append(f)
+        
         # Back Wall (The main wall)
-        # Check windows on 'back'
-        back_feats = [f for f in (room.windows or []) + (room.doors or []) if f.get('wall') == 'back']
         # If back wall has features, we should try to split it.
         # For simplicity, I will implement a "Simple Subdivision" for 1 feature.
         # If multiple, it gets tricky.
         
         # General algo: List of Rects. Start with 1 full wall.
-        # For each hole, split intersecting rects.
-        
-        def subtract_hole(rects, hole):
-            hx, hy, hw, hh = hole
-            new_rects = []
-            for rx, ry, rw, rh in rects:
-                # Check overlap
-                if not (hx >= rx + rw or hx + hw <= rx or hy >= ry + rh or hy + hh <= ry):
-                    # Overlap. Split rect.
-                    # 1. Left of hole
-                    if rx < hx:
-                        new_rects.append((rx, ry, hx - rx, rh))
-                    # 2. Right of hole
-                    if rx + rw > hx + hw:
-                        new_rects.append((hx + hw, ry, (rx + rw) - (hx + hw), rh))
-                    # 3. Below hole (spanning hole width)
-                    # We need to clamp to the hole vertical range relative to rect?
-                    # Be careful not to create overlaps.
-                    # A robust way: 
-                    # Top slab (above hole top)
-                    if ry + rh > hy + hh:
-                        # width is constrained to overlap? No, full rect width?
-                        # Using 4-way split is easier:
-                        # L, R are full height? Or L, R are middle?
-                        # Let's say: L and R are full height of rect?
-                        # No, simpler:
-                        # Top rect (full width of intersection)
-                        # Bottom rect (full width of intersection)
-                        # Left rect (middle height)
-                        # Right rect (middle height)
-                        pass
-                    
-                    # SIMPLER: Just 4 rects
-                    # Left
-                    if hx > rx:
-                        new_rects.append((rx, ry, hx - rx, rh))
-                    # Right
-                    if hx + hw < rx + rw:
-                        new_rects.append((hx + hw, ry, (rx + rw) - (hx + hw), rh))
-                    # Bottom (clamped to hole horizontal)
-                    # overlap_x_start = max(rx, hx)
-                    # overlap_x_end = min(rx+rw, hx+hw)
-                    # if overlap_x_end > overlap_x_start: ...
-                    
-                    # To avoid overlaps:
-                    # R1 (Left): rx to hx
-                    # R2 (Right): hx+hw to rx+rw
-                    # R3 (Bottom): max(rx, hx) to min(rx+rw, hx+hw), ry to hy
-                    # R4 (Top): max(rx, hx) to min(rx+rw, hx+hw), hy+hh to ry+rh
-                    
-                    overlap_x1 = max(rx, hx)
-                    overlap_x2 = min(rx + rw, hx + hw)
-                    
-                    if overlap_x2 > overlap_x1:
-                        # Bottom
-                        if hy > ry:
-                            new_rects.append((overlap_x1, ry, overlap_x2 - overlap_x1, hy - ry))
-                        # Top
-                        if hy + hh < ry + rh:
-                             new_rects.append((overlap_x1, hy + hh, overlap_x2 - overlap_x1, (ry + rh) - (hy + hh)))
-                             
-                else:
-                    new_rects.append((rx, ry, rw, rh))
-            return new_rects
-
+        # For each hole, split intersecting rects (rect_clip_aabb).
+        
         # Walls generation
         walls_config = [
             # name, width, height, z_pos, is_x_wall (False=Z wall), invert_ext
@@ -1113,22 +1050,20 @@ class OBJGenerator:
         ]
         
         for name, ww, wh, pos, is_lateral, ext_dir in walls_config:
-            # 1. Gather holes
-            feats = [f for f in (room.windows or []) + (room.doors or []) if f.get('wall') == name]
-            holes = []
-            for f in feats:
+            feats = feats_by_wall.get(name)
+            if not feats:
+                # Fast path: plain wall is one solid box, nothing to subdivide
+                rects = ((0, 0, ww, wh),)
+            else:
+                # 1. Gather holes
                 # x is along the wall width.
                 # For lateral walls, 'x' in json implies distance along that wall (which is Z room coord)
-                fx = f.get('x', 0)
-                fy = f.get('y', 0)
-                fw = f.get('width', 0)
-                fh = f.get('height', 0)
-                holes.append((fx, fy, fw, fh))
-            
-            # 2. Compute segments
-            rects = [(0, 0, ww, wh)]
-            for hole in holes:
-                rects = subtract_hole(rects, hole)
+                holes = [(f.get('x', 0), f.get('y', 0), f.get('width', 0), f.get('height', 0)) for f in feats]
+                
+                # 2. Compute segments
+                rects = [(0, 0, ww, wh)]
+                for hole in holes:
+                    rects = [piece for r in rects for piece in rect_clip_aabb(r, hole)]
                 
             # 3. Generate Boxes for rects
             for rx, ry, rwidth, rheight in rects:
@@ -1165,113 +1100,109 @@ class OBJGenerator:
         d = int(room.length) # Or generic 60cm depth check
         
         # We only really care about the kitchen run depth (e.g. 0-60)
-        # Let's scan x along the wall
-        for x in range(0, w, step):
-             # check height at wall and at depth 60
-             h1 = room.get_ceiling_height(x, 0)
-             h2 = room.get_ceiling_height(x + step, 0)
-             
-             if h1 < 200 or h2 < 200:
-                 # Draw a "marker" box here
-                 # height is room height? Or just a red box on floor?
-                 # Let's draw a box up to the ceiling
-                 self.add_box(x, 0, 0, step, min(h1, h2), 60)
+        # Let's scan x along the wall - all sample points in one vectorized query
+        xs = np.arange(0, w, step)
+        # check height at wall on both ends of each step
+        h1 = room.get_ceiling_height_array(xs, 0)
+        h2 = room.get_ceiling_height_array(xs + step, 0)
+        low = (h1 < 200) | (h2 < 200)
+        
+        # Draw a "marker" box up to the ceiling for every low step
+        for x, h in zip(xs[low].tolist(), np.minimum(h1, h2)[low].tolist()):
+            self.add_box(x, 0, 0, step, h, 60)
                  
     def generate_fillers(self, placed_items, room):
         """
         Generates filler panels for gaps between cabinets to create a built-in look.
         Respects Room Geometry (Slopes) and Forbidden Zones (Windows).
         """
-        # 1. Group by Layer (Base vs Wall)
-        base_items = []
-        wall_items = []
+        # Layer defaults: (default_h, default_d, layer_y) for Base (0) and Wall (1)
+        layers = ((85, 58, 0), (70, 33, 145))
         
-        for item in placed_items:
-            if item['y'] < 100:
-                base_items.append(item)
-            else:
-                wall_items.append(item)
+        # 1. Tag each item with its layer and sort once by (layer, X)
+        intervals = sorted(
+            ((0 if item['y'] < 100 else 1), item['x'], item['x'] + item['width'])
+            for item in placed_items
+        )
+        
+        # Add a dummy end after each layer's items to force check of its last gap
+        sweep = []
+        for i, iv in enumerate(intervals):
+            sweep.append(iv)
+            if i + 1 == len(intervals) or intervals[i + 1][0] != iv[0]:
+                sweep.append((iv[0], room.width, room.width))
                 
-        # Gather Windows on Back Wall
-        windows = [f for f in (room.windows or []) if f.get('wall') == 'back']
+        # Gather Windows on Back Wall as (x, x_end, y, height), sorted by X.
+        # win_max_end[i] is the furthest end among windows[0..i], so a backwards
+        # scan from the bisect point can stop once no earlier window reaches the gap.
+        windows = sorted(
+            (w['x'], w['x'] + w['width'], w['y'], w['height'])
+            for w in (room.windows or []) if w.get('wall') == 'back'
+        )
+        win_starts = [w[0] for w in windows]
+        win_max_end = list(accumulate((w[1] for w in windows), max))
+        
+        # 2. Single sweep over both layers, one gap pointer per layer
+        current_x = [0, 0]
         
-        # Helper to process a layer
-        def process_layer(items, default_h, default_d, layer_y):
-            if not items: return
+        for layer, start, end in sweep:
+            default_h, default_d, layer_y = layers[layer]
+            gap_start = current_x[layer]
+            current_x[layer] = max(gap_start, end)
             
-            # Sort by X
-            items.sort(key=lambda i: i['x'])
+            if start <= gap_start + 1: # 1cm tolerance
+                continue
+                
+            gap_width = start - gap_start
+            gap_end = start
+            gap_center = (gap_start + gap_end) / 2
             
-            # Combined list of occupied intervals
-            intervals = [(i['x'], i['x'] + i['width']) for i in items]
+            # Check Slope / Ceiling Height
+            # We check ceiling height at the center of the gap (simplified)
+            # Or check min height across gap.
+            ceil_h = room.get_ceiling_height(gap_center, default_d)
             
-            # Check gaps
-            current_x = 0
+            # If Box Top (layer_y + h) > ceil_h, we have a collision.
+            # Action: Clamp height or Skip?
+            # Profi: Clamp height to ceiling.
             
-            # Add dummy end to force check of last gap
-            intervals.append((room.width, room.width))
+            real_h = default_h
+            if layer_y + real_h > ceil_h:
+                real_h = max(0, ceil_h - layer_y)
+                
+            if real_h < 1: 
+                # Too small/clipping
+                continue
+                
+            # Check Window Collision
+            # If this gap overlaps a window, we need to respect it.
+            blocked_by_window = False
             
-            for start, end in intervals:
-                if start > current_x + 1: # 1cm tolerance
-                    gap_start = current_x
-                    gap_width = start - current_x
-                    gap_end = start
-                    gap_center = (gap_start + gap_end) / 2
-                    
-                    # 1. Check Slope / Ceiling Height
-                    # We check ceiling height at the center of the gap (simplified)
-                    # Or check min height across gap.
-                    ceil_h = room.get_ceiling_height(gap_center, default_d)
-                    
-                    # If Box Top (layer_y + h) > ceil_h, we have a collision.
-                    # Action: Clamp height or Skip?
-                    # Profi: Clamp height to ceiling.
-                    
-                    real_h = default_h
-                    if layer_y + real_h > ceil_h:
-                        real_h = max(0, ceil_h - layer_y)
-                        
-                    if real_h < 1: 
-                        # Too small/clipping
-                        current_x = max(current_x, end)
-                        continue
-                        
-                    # 2. Check Window Collision
-                    # If this gap overlaps a window, we need to respect it.
-                    blocked_by_window = False
-                    
-                    for w in windows:
-                        wx, wy, ww, wh = w['x'], w['y'], w['width'], w['height']
-                        # Intersection of [gap_start, gap_end] and [wx, wx+ww]
-                        overlap = max(0, min(gap_end, wx + ww) - max(gap_start, wx))
-                        
-                        if overlap > 1: # Significant overlap
-                            # Collision Logic
-                            # If Wall Layer: Window blocks 100%.
-                            if layer_y > 100: 
-                                blocked_by_window = True
-                                break
-                            # If Base Layer: Allow if under window (sill check)
-                            else:
-                                if layer_y + real_h > wy:
-                                    # Overlap in height too
-                                    # Clamp height to window sill?
-                                    # Ideally yes, let's make a low filler.
-                                    real_h = max(0, wy - layer_y)
-                                    if real_h < 1:
-                                        blocked_by_window = True
-                                    pass
-                                    
-                    if not blocked_by_window:
-                        self.add_box(gap_start, layer_y, 0, gap_width, real_h, default_d - 2)
-                    
-                current_x = max(current_x, end)
-
-        # Process Base
-        process_layer(base_items, 85, 58, 0)
-        
-        # Process Wall
-        process_layer(wall_items, 70, 33, 145)
+            # Only windows starting before the gap end can overlap it
+            idx = bisect_left(win_starts, gap_end - 1)
+            for j in range(idx - 1, -1, -1):
+                if win_max_end[j] <= gap_start + 1:
+                    break
+                wx, wx_end, wy, wh = windows[j]
+                # Intersection of [gap_start, gap_end] and [wx, wx+ww]
+                overlap = max(0, min(gap_end, wx_end) - max(gap_start, wx))
+                
+                if overlap > 1: # Significant overlap
+                    # Collision Logic
+                    # If Wall Layer: Window blocks 100%.
+                    if layer_y > 100: 
+                        blocked_by_window = True
+                        break
+                    # If Base Layer: Allow if under window (sill check)
+                    if layer_y + real_h > wy:
+                        # Overlap in height too
+                        # Clamp height to window sill - a low filler.
+                        real_h = max(0, wy - layer_y)
+                        if real_h < 1:
+                            blocked_by_window = True
+                            
+            if not blocked_by_window:
+                self.add_box(gap_start, layer_y, 0, gap_width, real_h, default_d - 2)
 
     # ========== PREMIUM GEOMETRY V3 ==========
     
@@ -1383,7 +1314,7 @@ class OBJGenerator:
     
     def generate_premium_cabinet(self, x: float, y: float, z: float, width: float, 
                                   height: float = 85, depth: float = 60,
-                                  layer_heights: List[int] = None,
+                                  layer_heights: Sequence[int] = None,
                                   with_gola: bool = True,
                                   is_end: str = None):  # 'left', 'right', or None
         """
@@ -1400,7 +1331,7 @@ class OBJGenerator:
         
         # Default layer heights (3 equal drawers)
         if layer_heights is None:
-            layer_heights = [25, 25, cabinet_h - 50]  # Three sections
+            layer_heights = (25, 25, cabinet_h - 50)  # Three sections
         
         thick = 1.8
         
@@ -1437,7 +1368,7 @@ class OBJGenerator:
     
     def generate_premium_item_by_type(self, item_type: str, x: float, y: float, z: float,
                                        width: float, height: float = 85, depth: float = 60,
-                                       layer_heights: List[int] = None, is_end: str = None,
+                                       layer_heights: Sequence[int] = None, is_end: str = None,
                                        **kwargs):
         """
         Premium dispatcher that routes to appropriate premium generator.
@@ -1702,11 +1633,19 @@ class OBJGenerator:
                 self.add_box(stool_x, 0, stool_z, 40, 65, 40)
 
     def save(self, filename: str):
+        # Format each block with one repeated %-template over the flattened
+        # buffer: a single C-level formatting pass instead of one f-string per row
+        vertices = self.vertices
+        faces = self.faces
         with open(filename, 'w') as f:
             f.write("# KitchenCore Generator Output\n")
-            for v in self.vertices:
-                f.write(f"v {v[0]:.4f} {v[1]:.4f} {v[2]:.4f}\n")
-            
-            for face in self.faces:
-                f_str = " ".join([str(idx) for idx in face])
-                f.write(f"f {f_str}\n")
+            f.write(('v %.4f %.4f %.4f\n' * len(vertices)) % tuple(vertices.ravel().tolist()))
+            # Quad runs between the (rare) non-quad faces, keeping insertion order
+            start = 0
+            for pos, polygon in self._polygons:
+                quads = faces[start:pos]
+                f.write(('f %d %d %d %d\n' * len(quads)) % tuple(quads.ravel().tolist()))
+                f.write("f " + " ".join(map(str, polygon)) + "\n")
+                start = pos
+            quads = faces[start:]
+            f.write(('f %d %d %d %d\n' * len(quads)) % tuple(quads.ravel().tolist()))
@@ -1,5 +1,44 @@
 from dataclasses import dataclass
 from typing import List, Dict, Optional, Tuple
+import math
+import numpy as np
+
+# Slope wall codes used by Room.get_ceiling_height
+_WALL_LEFT, _WALL_RIGHT, _WALL_BACK = 0, 1, 2
+_SLOPE_WALLS = {'left': _WALL_LEFT, 'right': _WALL_RIGHT, 'back': _WALL_BACK}
+
+# Axis-aligned rect: (x, y, width, height)
+Rect = Tuple[float, float, float, float]
+
+
+def rect_clip_aabb(rect: Rect, clipper: Rect) -> List[Rect]:
+    """
+    Returns the parts of `rect` lying outside `clipper` (both axis-aligned).
+    
+    Up to 4 non-overlapping pieces: full-height Left/Right slabs, then
+    Bottom/Top pieces spanning only the horizontal overlap.
+    If the rects do not overlap, `rect` is returned unchanged.
+    """
+    rx, ry, rw, rh = rect
+    cx, cy, cw, ch = clipper
+    if cx >= rx + rw or cx + cw <= rx or cy >= ry + rh or cy + ch <= ry:
+        return [rect]
+    
+    pieces = []
+    # Left / Right (full height of rect)
+    if cx > rx:
+        pieces.append((rx, ry, cx - rx, rh))
+    if cx + cw < rx + rw:
+        pieces.append((cx + cw, ry, (rx + rw) - (cx + cw), rh))
+    
+    # Bottom / Top (clamped to the horizontal overlap)
+    x1 = max(rx, cx)
+    x2 = min(rx + rw, cx + cw)
+    if cy > ry:
+        pieces.append((x1, ry, x2 - x1, cy - ry))
+    if cy + ch < ry + rh:
+        pieces.append((x1, cy + ch, x2 - x1, (ry + rh) - (cy + ch)))
+    return pieces
 
 @dataclass
 class Slope:
@@ -47,6 +86,14 @@ class Room:
     shape: str = 'I'  # 'I', 'L', 'U', 'auto'
     wall_b_length: float = 0  # Second arm length for L/U shapes
 
+    def __post_init__(self):
+        # Flattened slope parameters for get_ceiling_height (no method call per slope)
+        self._slope_walls = [_SLOPE_WALLS.get(s.wall, -1) for s in self.slopes]
+        self._slope_starts = [s.start_height for s in self.slopes]
+        self._slope_tans = [math.tan(math.radians(s.angle)) for s in self.slopes]
+        self._has_slopes = bool(self.slopes)
+        self._valid_x_cache: Dict[Tuple[float, float, float], Tuple[Tuple[int, int], ...]] = {}
+
     @classmethod
     def from_dict(cls, data: dict):
         slopes_data = data.get('slopes', [])
@@ -63,6 +110,92 @@ class Room:
             wall_b_length=data.get('wall_b_length', 0)
         )
 
+    def get_ceiling_height(self, x: float, z: float) -> float:
+        """
+        Returns the lowest ceiling height at (x, z) considering all slopes.
+        """
+        # Flat ceiling - nothing to evaluate
+        if not self._has_slopes:
+            return self.height
+            
+        # Slope.get_height_at inlined over the precomputed slope parameters
+        current_min = self.height
+        for wall, start, tan in zip(self._slope_walls, self._slope_starts, self._slope_tans):
+            if wall == _WALL_LEFT:
+                dist = x
+            elif wall == _WALL_RIGHT:
+                dist = self.width - x
+            elif wall == _WALL_BACK:
+                dist = z
+            else:
+                dist = 0.0
+            h = start + dist * tan
+            if h < current_min:
+                current_min = h
+        return current_min
+
+    def get_ceiling_height_array(self, xs, zs) -> np.ndarray:
+        """
+        Vectorized get_ceiling_height for arrays of x and z (broadcast together).
+        """
+        xs = np.asarray(xs, dtype=np.float64)
+        zs = np.asarray(zs, dtype=np.float64)
+        heights = np.full(np.broadcast(xs, zs).shape, self.height, dtype=np.float64)
+        for wall, start, tan in zip(self._slope_walls, self._slope_starts, self._slope_tans):
+            if wall == _WALL_LEFT:
+                dist = xs
+            elif wall == _WALL_RIGHT:
+                dist = self.width - xs
+            elif wall == _WALL_BACK:
+                dist = zs
+            else:
+                dist = 0.0
+            np.minimum(heights, start + dist * tan, out=heights)
+        return heights
+
+    def get_valid_x_intervals(self, item_width: float, item_height: float, item_depth: float = 60.0) -> List[Tuple[int, int]]:
+        """
+        Returns a list of (start_x, end_x) intervals where the item fits vertically.
+        We check height at the item's corners along the wall (assuming depth is towards center).
+        Kitchen items are usually placed against a wall (Z=Length or Z=0? Prompt implies lines).
+        
+        Let's assume a "Left-to-Right" placement along the BACK wall (Z = Length) or similar.
+        The prompt says "X position for each requested item".
+        Usually kitchen runs are linear. Let's assume standard placement along the Z=Length wall (Back wall) or Z=0.
+        However, if slopes are 'left' or 'right', X varies.
+        
+        Let's scan X from 0 to Room Width - Item Width.
+        """
+        # Memoized per (width, height, depth) - the solver asks again for every model build
+        key = (item_width, item_height, item_depth)
+        cached = self._valid_x_cache.get(key)
+        if cached is not None:
+            return list(cached)
+        
+        # Placement along the wall at Z=0: check ceiling height at the 4 corners of the
+        # volume - (x, 0), (x + w, 0), (x, depth), (x + w, depth) - for every 1cm start x.
+        room_w_int = int(self.width)
+        width_int = int(item_width)
+        xs = np.arange(0, room_w_int - width_int + 1, dtype=np.float64)
+        
+        valid_intervals = []
+        if xs.size:
+            # One vectorized height table per corner line (z = wall, z = front)
+            corners_x = np.stack((xs, xs + item_width))
+            min_h = np.minimum(
+                self.get_ceiling_height_array(corners_x, 0.0).min(axis=0),
+                self.get_ceiling_height_array(corners_x, float(item_depth)).min(axis=0)
+            )
+            fits = min_h >= item_height
+            
+            # Contiguous runs of valid start positions
+            edges = np.flatnonzero(np.diff(np.concatenate(([False], fits, [False])).astype(np.int8)))
+            valid_intervals = [(int(lo), int(hi) - 1) for lo, hi in zip(edges[::2], edges[1::2])]
+        
+        self._valid_x_cache[key] = tuple(valid_intervals)
+        return valid_intervals
+
+
 
 @dataclass
 class CornerModule:
@@ -102,93 +235,3 @@ class CornerModule:
             return 60  # More accessible with lazy susan
         else:
             return 45  # Diagonal has moderate access
-
-    def get_ceiling_height(self, x: float, z: float) -> float:
-        """
-        Returns the lowest ceiling height at (x, z) considering all slopes.
-        """
-        current_min = self.height
-        for slope in self.slopes:
-            h = slope.get_height_at(x, z, self.width, self.length, self.height)
-            if h < current_min:
-                current_min = h
-        return current_min
-
-    def get_valid_x_intervals(self, item_width: float, item_height: float, item_depth: float = 60.0) -> List[Tuple[int, int]]:
-        """
-        Returns a list of (start_x, end_x) intervals where the item fits vertically.
-        We check height at the item's corners along the wall (assuming depth is towards center).
-        Kitchen items are usually placed against a wall (Z=Length or Z=0? Prompt implies lines).
-        
-        Let's assume a "Left-to-Right" placement along the BACK wall (Z = Length) or similar.
-        The prompt says "X position for each requested item".
-        Usually kitchen runs are linear. Let's assume standard placement along the Z=Length wall (Back wall) or Z=0.
-        However, if slopes are 'left' or 'right', X varies.
-        
-        Let's scan X from 0 to Room Width - Item Width.
-        """
-        valid_intervals = []
-        
-        # We assume standard placement at Z = 0 (or Z=Length). Let's pick Z=0 as "back wall" reference for now, 
-        # or ask user? The utils are at 'water_x', 'gas_x', implying a 1D placement line.
-        # Let's assume the installation depth is `item_depth`.
-        # We need to check height at (x, 0) and (x + width, 0) and potentially (x, depth) and (x+width, depth)
-        # if the slope comes from the back.
-        # But usually slopes are "attic" style.
-        
-        # Let's use a step size for scanning (e.g. 1cm) or analytical if simple.
-        # Scanning 1cm is safe and fast enough for 400cm.
-        
-        # We need to find contiguous ranges of valid start positions.
-        
-        room_w_int = int(self.width)
-        width_int = int(item_width)
-        
-        current_start = -1
-        
-        # Check Z at the wall (e.g., 0) and at the front of the cabinet (depth).
-        # We'll assume the wall is at Z=RoomLength (Back) or Z=0. 
-        # Prompt utils: water_x=150.
-        # Let's assume items are placed along the wall at Z=RoomLength (typical for "Back" wall view).
-        # Actually usually cabinets are against the wall.
-        # Let's assume the main run is along the wall at Z=0 or Z=Length.
-        # If the slope is "back", it changes with Z.
-        # If the slope is "left/right", it changes with X.
-        
-        # Let's assume placement is along Z=0 for simplicity (Front view) or Z=Length.
-        # Given "Back" wall slope, let's assume items are against Z=0 (Front) or Z=Length (Back).
-        # Let's assume Z positions are fixed (e.g., against a wall).
-        # We will check height at Z=0 (wall) and Z=depth (front of cabinet).
-        
-        # WAIT: If utilities are given as X, it's a 1D problem.
-        # Let's assume placement is along a single wall (e.g. the Back wall at Z=Length? or Z=0?).
-        # Standard convention: Viewer looking at wall.
-        # Let's default to checking Z from 0 to depth. (Wait, if slope is at 'back' wall, height might be lowest there).
-        
-        # Let's assume the wall line is at Z=0.
-        z_wall = 0.0
-        z_front = item_depth
-        
-        for x in range(0, room_w_int - width_int + 1):
-            # Check 4 corners of the volumes
-            # (x, z_wall), (x+w, z_wall), (x, z_front), (x+w, z_front)
-            
-            h1 = self.get_ceiling_height(x, z_wall)
-            h2 = self.get_ceiling_height(x + item_width, z_wall)
-            h3 = self.get_ceiling_height(x, z_front)
-            h4 = self.get_ceiling_height(x + item_width, z_front)
-            
-            min_h = min(h1, h2, h3, h4)
-            
-            if min_h >= item_height:
-                if current_start == -1:
-                    current_start = x
-            else:
-                if current_start != -1:
-                    valid_intervals.append((current_start, x - 1))
-                    current_start = -1
-                    
-        if current_start != -1:
-             valid_intervals.append((current_start, room_w_int - width_int))
-             
-        return valid_intervals
@@ -1,19 +1,12 @@
-from dataclasses import dataclass
 from typing import List, Dict, Any, Tuple
 import math
+import numpy as np
 
-@dataclass
-class Vector3:
-    x: float
-    y: float
-    z: float
+# (x, y, z) point - plain tuples avoid per-attribute lookups in the hot loop
+Point3 = Tuple[float, float, float]
 
-    @classmethod
-    def from_dict(cls, d: Dict[str, Any]):
-        return cls(d.get('x', 0), d.get('y', 0), d.get('z', 0))
-
-    def dist(self, other: 'Vector3') -> float:
-        return math.sqrt((self.x - other.x)**2 + (self.y - other.y)**2 + (self.z - other.z)**2)
+def _dist(a: Point3, b: Point3) -> float:
+    return math.sqrt((a[0] - b[0])**2 + (a[1] - b[1])**2 + (a[2] - b[2])**2)
 
 class GhostChef:
     def __init__(self):
@@ -30,46 +23,48 @@ class GhostChef:
         Cost is primarily travel distance.
         """
         volumes = skeleton['volumes']
-        # Map function to center position
-        zone_map = {}
+        # Map function to zone centers.
+        # Multiple zones of the same type (e.g. 2 prep zones) are also packed
+        # into (n, 3) arrays so the closest-zone lookup is one norm + argmin.
+        zone_points: Dict[str, List[Point3]] = {}
         for v in volumes:
-            func = v['function']
-            center = Vector3(v['x'] + v['width']/2, 0, v['metadata'].get('depth', 60)) # Approximate Z
-            
-            # Handle multiple zones of same type? (e.g. 2 prep zones)
-            # For simplicity, keep list
-            if func not in zone_map:
-                zone_map[func] = []
-            zone_map[func].append(center)
+            center = (v['x'] + v['width']/2, 0, v['metadata'].get('depth', 60)) # Approximate Z
+            zone_points.setdefault(v['function'], []).append(center)
+        zone_xyz = {func: np.array(points, dtype=np.float64)
+                    for func, points in zone_points.items() if len(points) > 1}
+        
+        # Assume Door/Entry. Let's fake it as Center of Room for now
+        entry = (room_width / 2, 0, 150) # Middle of room
             
-        # Helper to get closest zone of type
-        def get_pos(func_name: str, current_pos: Vector3) -> Vector3:
+        # Helper to get closest zone of type -> (position, distance)
+        def get_pos(func_name: str, current_pos: Point3) -> Tuple[Point3, float]:
             if func_name == "serving":
-                # Assume Door/Entry. Let's fake it as Center of Room for now, or X=0
-                return Vector3(room_width / 2, 0, 150) # Middle of room
+                return entry, _dist(entry, current_pos)
                 
-            candidates = zone_map.get(func_name)
-            if not candidates:
-                # Fallback mapping
-                if func_name == "pantry": candidates = zone_map.get("fridge") # Fallback to fridge
-                if func_name == "serving": candidates = [Vector3(0,0,0)]
+            if func_name not in zone_points and func_name == "pantry":
+                func_name = "fridge" # Fallback to fridge
                 
+            candidates = zone_points.get(func_name)
             if not candidates:
-                return current_pos # Stay put if missing (penalty?)
+                return current_pos, 0.0 # Stay put if missing (penalty?)
+                
+            if len(candidates) == 1:
+                return candidates[0], _dist(candidates[0], current_pos)
                 
-            # Return closest
-            return min(candidates, key=lambda p: p.dist(current_pos))
+            # Return closest - argmin over squared distances, sqrt only the winner
+            diff = zone_xyz[func_name] - current_pos
+            d2 = np.einsum('ij,ij->i', diff, diff)
+            idx = int(d2.argmin())
+            return candidates[idx], math.sqrt(d2[idx])
 
         total_distance = 0.0
         
         for name, routine in self.workflows.items():
             # Start at entry
-            pos = Vector3(room_width/2, 0, 150) 
+            pos = entry
             
             for step in routine:
-                target = get_pos(step, pos)
-                dist = pos.dist(target)
+                pos, dist = get_pos(step, pos)
                 total_distance += dist
-                pos = target
                 
         return total_distance
@@ -6,6 +6,7 @@ This creates the professional "expensive" look where drawer heights are consiste
 """
 
 from dataclasses import dataclass
+from functools import cached_property
 from typing import List, Tuple
 from enum import Enum
 
@@ -17,11 +18,12 @@ class LayerPreset(Enum):
     DOOR_2DRAWER = "door_2d" # Door + 2 drawers
     FULL_DOOR = "full_door"  # Single door
 
-@dataclass
+@dataclass(frozen=True)
 class LayerSchema:
     """
     Defines horizontal seam positions for a cabinet column.
     Heights are measured from cabinet bottom (0) to top (typically 85cm for base).
+    Frozen (hashable) so derived data such as tile libraries can be cached per schema.
     """
     seam_heights: Tuple[int, ...]  # Heights where seams occur
     content_types: Tuple[str, ...]  # What's in each layer ('drawer', 'door', 'internals')
@@ -31,15 +33,15 @@ class LayerSchema:
     def num_layers(self) -> int:
         return len(self.seam_heights)
     
-    @property
-    def layer_heights(self) -> List[int]:
-        """Returns the height of each layer."""
+    @cached_property
+    def layer_heights(self) -> Tuple[int, ...]:
+        """Returns the height of each layer (computed once, shared read-only tuple)."""
         heights = []
         prev = 0
         for h in self.seam_heights:
             heights.append(h - prev)
             prev = h
-        return heights
+        return tuple(heights)
     
     # === STANDARD PRESETS ===
     
@@ -1,7 +1,9 @@
 import json
 import argparse
+import logging
 import sys
 import os
+from bisect import bisect_left, bisect_right
 from datetime import datetime
 from kitchen_core.geometry import Room
 from kitchen_core.solver import KitchenSolver, StorageValidator, WorkflowSolver, WishlistExpander
@@ -12,6 +14,30 @@ from kitchen_core.style_grammar import StyleCritic
 from kitchen_core.heatmaps import HeatmapSolver
 from kitchen_core.heatmaps.visualize import export_combined_debug, export_placement_diagram
 
+# Optional fast JSON encoder (orjson - not required, stdlib json writes the same format)
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def write_json(path: str, data, compact: bool = False):
+    """
+    Serialize `data` in one encoder pass and write it with a single call.
+    compact=True skips indentation (stdlib then uses its C encoder too).
+    Both encoders write the same 2-space indented format.
+    """
+    if HAS_ORJSON:
+        out = orjson.dumps(data) if compact else orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    elif compact:
+        out = json.dumps(data, separators=(',', ':')).encode()
+    else:
+        out = json.dumps(data, indent=2).encode()
+    with open(path, 'wb') as f:
+        f.write(out)
+
+
 def main():
     parser = argparse.ArgumentParser(description="Kitchen Generator V3 - Premium Architecture")
     parser.add_argument("input_file", help="Path to input JSON file")
@@ -23,6 +49,9 @@ def main():
                         help="Export heatmap debug PNG images")
     args = parser.parse_args()
     
+    # Solver progress goes through logging - show it like the rest of the console report
+    logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stdout)
+    
     with open(args.input_file, 'r') as f:
         data = json.load(f)
         
@@ -51,7 +80,7 @@ def main():
         # Auto-detect shape if needed
         actual_shape = room.shape
         if room.shape == 'auto':
-            actual_shape = solver.detect_optimal_shape(wishlist)
+            actual_shape = solver.detect_optimal_shape(wishlist, expander.base_width)
             print(f"\n[Auto-Shape] Detected: {actual_shape}")
         
         if actual_shape == 'L':
@@ -120,7 +149,7 @@ def main():
         island_config = None
         if storage_eval['status'] == 'UNDER-STORAGE' and storage_eval['suggest_island']:
             # Calculate Island size based on deficit
-            deficit_m = storage_eval['deficit_m']
+            deficit_m = round(storage_eval['deficit_m'], 1)  # Island sized in 0.1m steps
             island_width = min(max(120, deficit_m * 30), 240)  # 120-240cm based on need
             island_depth = 90
             
@@ -232,19 +261,21 @@ def main():
     
     placed_items = []
     
+    # Utilities indexed by X for the cutout lookup below
+    utilities = sorted((u for u in room.utilities if u.get('x') is not None), key=lambda u: u['x'])
+    utility_xs = [u['x'] for u in utilities]
+    
     # Base Items from Skin
     for item in items:
         # Smart Cutouts Logic (Back holes for utilities)
         cutouts = []
         cx = item['x']
         cw = item['width']
-        # Simple collision check with utilities
-        for u in room.utilities:
-             ux = u.get('x')
-             if ux is not None and cx <= ux <= cx + cw: # Utility behind cabinet
-                 # Calculate relative pos
-                 rel_x = ux - cx
-                 cutouts.append((rel_x, u.get('y', 10), 50.0, 50.0))
+        # Utilities behind cabinet: cx <= ux <= cx + cw
+        for u in utilities[bisect_left(utility_xs, cx):bisect_right(utility_xs, cx + cw)]:
+            # Calculate relative pos
+            rel_x = u['x'] - cx
+            cutouts.append((rel_x, u.get('y', 10), 50.0, 50.0))
         
         # Generate using specialized dispatcher
         # Handle L-shape: Arm B items are on Z axis (perpendicular wall)
@@ -297,16 +328,21 @@ def main():
     
     # Generate Worktop
     if placed_items:
-        min_x = min(i['x'] for i in placed_items)
-        max_x = max(i['x'] + i['width'] for i in placed_items)
-        
-        # Identify holes (Sink/Stove)
+        # Extent and holes (Sink/Stove) in a single pass
+        min_x = float('inf')
+        max_x = float('-inf')
         holes = []
         for i in placed_items:
+            x = i['x']
+            w = i['width']
+            if x < min_x:
+                min_x = x
+            if x + w > max_x:
+                max_x = x + w
             t = i['type']
             if 'sink' in t or 'stove' in t:
                 # Hole inset 5cm?
-                holes.append((i['x'] + 5, i['width'] - 10))
+                holes.append((x + 5, w - 10))
                 
         gen.generate_worktop(min_x, max_x, 85, 60, holes)
     
@@ -321,12 +357,10 @@ def main():
     
     # Save JSON
     json_path = os.path.join(out_dir, "layout.json")
-    with open(json_path, 'w') as f:
-        json.dump(placed_items, f, indent=4)
+    write_json(json_path, placed_items)
         
-    # Save Input Copy
-    with open(os.path.join(out_dir, "input_snapshot.json"), 'w') as f:
-        json.dump(data, f, indent=4)
+    # Save Input Copy (machine-read only, so compact)
+    write_json(os.path.join(out_dir, "input_snapshot.json"), data, compact=True)
     
     # Export heatmap debug images if requested
     if args.heatmaps and args.debug_maps and 'heatmap_debug' in skeleton:
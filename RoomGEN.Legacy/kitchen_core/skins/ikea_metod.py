@@ -1,6 +1,40 @@
 from typing import List, Dict, Any
 from .base import Skin
 
+# Fill modules for leftover zone width, largest first: width -> (type, num_drawers).
+# 60 is handled separately (alternates drawer_cabinet / base_cabinet).
+_FILL_MODULES = {
+    80: ('drawer_cabinet', 4),  # Drawer cabinets for wider spaces (preferred for prep)
+    60: ('drawer_cabinet', 3),
+    40: ('base_cabinet', None),
+    30: ('bottle_rack', 5),     # Narrow pull-out (spice rack style)
+    20: ('bottle_rack', 5),
+}
+_MIN_FILLER = 5  # Narrower gaps are ignored
+
+
+def _greedy_decompose(width):
+    """Greedy split of `width` into fill modules -> (module widths, filler width or 0)."""
+    modules = []
+    for module_w in _FILL_MODULES:
+        count, width = divmod(width, module_w)
+        modules.extend([module_w] * int(count))
+    return tuple(modules), (width if width >= _MIN_FILLER else 0)
+
+
+# Leading modules of wet / cooking zones: function -> ((type, widths widest first), ...)
+_ZONE_LEAD_MODULES = {
+    # Wet Zone: Sink (60-80) + Dishwasher (60) + optional storage
+    'wet': (('sink_cabinet', (80, 60)), ('dishwasher', (60,))),
+    # Cooking Zone: Stove/Cooktop (60-90). Oven under the cooktop would need
+    # separate tall unit logic, so it is not placed in the base layer.
+    'cooking': (('stove_cabinet', (90, 60)),),
+}
+
+# Decomposition table for every integer width up to a long kitchen run
+_DECOMP_MAX = 600
+_DECOMP = [_greedy_decompose(w) for w in range(_DECOMP_MAX + 1)]
+
 class IkeaSkin(Skin):
     """
     IKEA Metod kitchen skin - translates functional zones into specific cabinet modules.
@@ -39,35 +73,16 @@ class IkeaSkin(Skin):
             
             # ========== ZONE-SPECIFIC LOGIC ==========
             
-            if func == 'wet':
-                # Wet Zone: Sink (60-80) + Dishwasher (60) + optional storage
-                if remaining_w >= 80:
-                    items.append({'type': 'sink_cabinet', 'width': 80, 'x': current_x, 'height': 85})
-                    current_x += 80
-                    remaining_w -= 80
-                elif remaining_w >= 60:
-                    items.append({'type': 'sink_cabinet', 'width': 60, 'x': current_x, 'height': 85})
-                    current_x += 60
-                    remaining_w -= 60
-                
-                if remaining_w >= 60:
-                    items.append({'type': 'dishwasher', 'width': 60, 'x': current_x, 'height': 85})
-                    current_x += 60
-                    remaining_w -= 60
-            
-            elif func == 'cooking':
-                # Cooking Zone: Stove/Cooktop (60-90) + optionally Oven (60)
-                if remaining_w >= 90:
-                    items.append({'type': 'stove_cabinet', 'width': 90, 'x': current_x, 'height': 85})
-                    current_x += 90
-                    remaining_w -= 90
-                elif remaining_w >= 60:
-                    items.append({'type': 'stove_cabinet', 'width': 60, 'x': current_x, 'height': 85})
-                    current_x += 60
-                    remaining_w -= 60
-                
-                # Add oven if space allows (built-in under cooktop requires tall cabinet)
-                # For now, skip oven in base layer - would need separate tall unit logic
+            lead_modules = _ZONE_LEAD_MODULES.get(func)
+            if lead_modules is not None:
+                # Wet / cooking: place each leading module at the widest size that fits
+                for item_type, widths in lead_modules:
+                    for mod_w in widths:
+                        if remaining_w >= mod_w:
+                            items.append({'type': item_type, 'width': mod_w, 'x': current_x, 'height': 85})
+                            current_x += mod_w
+                            remaining_w -= mod_w
+                            break
             
             elif func == 'fridge':
                 # Fridge is a single tall unit
@@ -88,48 +103,30 @@ class IkeaSkin(Skin):
             
             # ========== FILL REMAINING SPACE ==========
             
-            while remaining_w > 0:
-                placed = False
-                
-                # Try drawer cabinets for wider spaces (preferred for prep)
-                if remaining_w >= 80:
-                    items.append({'type': 'drawer_cabinet', 'width': 80, 'x': current_x, 'height': 85, 'num_drawers': 4})
-                    current_x += 80
-                    remaining_w -= 80
-                    placed = True
-                elif remaining_w >= 60:
-                    # Alternate between drawers and cabinets for visual variety
-                    item_type = 'drawer_cabinet' if len(items) % 2 == 0 else 'base_cabinet'
-                    items.append({'type': item_type, 'width': 60, 'x': current_x, 'height': 85, 'num_drawers': 3})
-                    current_x += 60
-                    remaining_w -= 60
-                    placed = True
-                elif remaining_w >= 40:
-                    items.append({'type': 'base_cabinet', 'width': 40, 'x': current_x, 'height': 85})
-                    current_x += 40
-                    remaining_w -= 40
-                    placed = True
-                elif remaining_w >= 30:
-                    # Narrow pull-out (spice rack style)
-                    items.append({'type': 'bottle_rack', 'width': 30, 'x': current_x, 'height': 85, 'num_drawers': 5})
-                    current_x += 30
-                    remaining_w -= 30
-                    placed = True
-                elif remaining_w >= 20:
-                    items.append({'type': 'bottle_rack', 'width': 20, 'x': current_x, 'height': 85, 'num_drawers': 5})
-                    current_x += 20
-                    remaining_w -= 20
-                    placed = True
-                elif remaining_w >= 5:
-                    # Small filler panel
-                    items.append({'type': 'filler', 'width': remaining_w, 'x': current_x, 'height': 85})
-                    current_x += remaining_w
-                    remaining_w = 0
-                    placed = True
+            if remaining_w > 0:
+                if isinstance(remaining_w, int) and remaining_w <= _DECOMP_MAX:
+                    modules, filler_w = _DECOMP[remaining_w]
                 else:
-                    # Tiny gap - ignore
-                    remaining_w = 0
-                    placed = True
+                    modules, filler_w = _greedy_decompose(remaining_w)
+                    
+                for cab_w in modules:
+                    if cab_w == 60:
+                        # Alternate between drawers and cabinets for visual variety
+                        item_type = 'drawer_cabinet' if len(items) % 2 == 0 else 'base_cabinet'
+                        items.append({'type': item_type, 'width': 60, 'x': current_x, 'height': 85, 'num_drawers': 3})
+                    else:
+                        item_type, num_drawers = _FILL_MODULES[cab_w]
+                        item = {'type': item_type, 'width': cab_w, 'x': current_x, 'height': 85}
+                        if num_drawers:
+                            item['num_drawers'] = num_drawers
+                        items.append(item)
+                    current_x += cab_w
+                    
+                if filler_w:
+                    # Small filler panel
+                    items.append({'type': 'filler', 'width': filler_w, 'x': current_x, 'height': 85})
+                    current_x += filler_w
+                # Tiny gap (< 5cm) - ignore
         
         # ========== WALL ITEMS ==========
         
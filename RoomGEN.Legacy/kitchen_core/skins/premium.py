@@ -4,11 +4,20 @@ Premium Skin for Premium Kitchen Architecture V3.
 Uses Layer Grid and Slice Composition for professional "půl milionu" look.
 """
 
+import logging
 from typing import List, Dict, Any
 from .base import Skin
 from ..layers import LayerSchema, get_dominant_layer_schema
 from ..slices import SliceComposer, SliceSequence
 
+logger = logging.getLogger(__name__)
+
+# Shared read-only fallback for volumes without metadata (never mutate)
+_EMPTY: Dict[str, Any] = {}
+
+# Workbench functions that get the shared layer grid
+_LAYERED_TYPES = frozenset({'drawer_cabinet', 'prep', 'landing', 'secondary', 'base_cabinet'})
+
 class PremiumSkin(Skin):
     """
     Premium skin that generates cabinets with:
@@ -26,38 +35,55 @@ class PremiumSkin(Skin):
         volumes = skeleton['volumes']
         items = []
         
-        # Determine dominant layer schema based on workbench width
-        workbench_vols = [v for v in volumes if not v.get('metadata', {}).get('is_monolith')]
-        monolith_vols = [v for v in volumes if v.get('metadata', {}).get('is_monolith')]
+        # Partition into Workbench / Monolith and collect workbench widths in one pass.
+        # The same pass tracks positions for end panel detection.
+        workbench_vols = []
+        monolith_vols = []
+        workbench_widths = []
+        leftmost_x = float('inf')
+        rightmost_end = float('-inf')
+        for v in volumes:
+            x = v['x']
+            if x < leftmost_x:
+                leftmost_x = x
+            end = x + v['width']
+            if end > rightmost_end:
+                rightmost_end = end
+            
+            if (v.get('metadata') or _EMPTY).get('is_monolith'):
+                monolith_vols.append(v)
+            else:
+                workbench_vols.append(v)
+                workbench_widths.append(v['width'])
+        if not volumes:
+            leftmost_x = rightmost_end = 0
+        # Right end panel threshold (1cm tolerance), computed once for both loops
+        right_edge = rightmost_end - 1
         
-        # Calculate layer schema for workbench
-        workbench_widths = [v['width'] for v in workbench_vols]
+        # Determine dominant layer schema based on workbench width
         layer_schema = get_dominant_layer_schema(workbench_widths)
         layer_heights = layer_schema.layer_heights
         
-        print(f"  Layer Schema: {layer_schema.preset.value} -> Heights: {layer_heights}")
-        
-        # Track positions for end panel detection
-        all_x_positions = sorted([v['x'] for v in volumes])
-        leftmost_x = min(all_x_positions) if all_x_positions else 0
-        rightmost_end = max(v['x'] + v['width'] for v in volumes) if volumes else 0
+        logger.debug("Layer Schema: %s -> Heights: %s", layer_schema.preset.value, layer_heights)
         
         # === PROCESS MONOLITH (Tall Block) - May be on Z axis for L-shape ===
-        for i, vol in enumerate(monolith_vols):
-            x = vol.get('x', 0)
-            z = vol.get('z', 0)  # Z position for L-shape Arm B
+        for vol in monolith_vols:
+            # Bind every lookup once per volume
+            vol_get = vol.get
+            x = vol_get('x', 0)
+            z = vol_get('z', 0)  # Z position for L-shape Arm B
             w = vol['width']
             func = vol['function']
-            meta = vol.get('metadata', {})
-            height = meta.get('height', 215)
-            axis = meta.get('axis', 'X')  # 'X' for Arm A, 'Z' for Arm B
+            meta_get = (vol_get('metadata') or _EMPTY).get
+            height = meta_get('height', 215)
+            axis = meta_get('axis', 'X')  # 'X' for Arm A, 'Z' for Arm B
             
             # Determine if this is an edge item
             is_end = None
             if axis == 'X':
                 if x == leftmost_x:
                     is_end = 'left'
-                elif x + w >= rightmost_end - 1:
+                elif x + w >= right_edge:
                     is_end = 'right'
             
             items.append({
@@ -74,42 +100,39 @@ class PremiumSkin(Skin):
         
         # === PROCESS WORKBENCH (Base Line) - Direct item type pass-through ===
         # WorkflowSolver now provides actual item types (sink_cabinet, dishwasher, fridge, etc.)
-        for i, vol in enumerate(workbench_vols):
-            x = vol.get('x', 0)
-            z = vol.get('z', 0)
+        for vol in workbench_vols:
+            # Bind every lookup once per volume
+            vol_get = vol.get
+            x = vol_get('x', 0)
+            z = vol_get('z', 0)
             w = vol['width']
             func = vol['function']
-            meta = vol.get('metadata', {})
-            axis = meta.get('axis', 'X')
-            height = meta.get('height', 85)
+            meta_get = (vol_get('metadata') or _EMPTY).get
+            axis = meta_get('axis', 'X')
+            height = meta_get('height', 85)
             
             # Determine if end panel is needed
             is_end = None
             if x == leftmost_x:
                 is_end = 'left'
-            elif x + w >= rightmost_end - 1:
+            elif x + w >= right_edge:
                 is_end = 'right'
             
-            # Build item with actual function type
-            item = {
+            # Build item with actual function type - one literal with a fixed key set
+            # (same shape as monolith items; unused keys stay None)
+            items.append({
                 'type': func,
                 'x': x,
                 'z': z,
                 'width': w,
                 'height': height,
                 'depth': 60,
-                'axis': axis
-            }
-            
-            # Add layer heights for drawer-type cabinets
-            if func in ['drawer_cabinet', 'prep', 'landing', 'secondary', 'base_cabinet']:
-                item['layer_heights'] = layer_heights
-            
-            # Add end panel info
-            if is_end:
-                item['is_end'] = is_end
-            
-            items.append(item)
+                'axis': axis,
+                # Layer heights for drawer-type cabinets
+                'layer_heights': layer_heights if func in _LAYERED_TYPES else None,
+                # End panel info
+                'is_end': is_end
+            })
         
         return items
 
@@ -6,11 +6,17 @@ with specific seam positions. Adjacent slices must have matching seam heights.
 """
 
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import List, Tuple, Set, Optional, Dict
 from .layers import LayerSchema, LayerPreset
 import random
 
-@dataclass
+# Tile preference by width: 60 > 80 > 40 > 30 > 20 > others (index = width in cm)
+_PRIO: List[int] = [10] * 81
+for _prio, _width in enumerate((60, 80, 40, 30, 20)):
+    _PRIO[_width] = _prio
+
+@dataclass(slots=True, frozen=True)
 class SliceTile:
     """
     A vertical slice representing one cabinet module with defined layer structure.
@@ -29,42 +35,55 @@ class SliceTile:
     
     def compatible_with(self, other: 'SliceTile') -> bool:
         """Check if this tile can be placed next to another."""
-        return self.seam_heights == other.seam_heights
+        # Tiles from one library share the schema object - identity is the common case
+        return (self.layer_schema is other.layer_schema
+                or self.layer_schema.seam_heights == other.layer_schema.seam_heights)
 
 
 # === TILE LIBRARY ===
 
-def create_tile_library(layer_schema: LayerSchema) -> List[SliceTile]:
+# Interned tiles keyed by (width, layer_schema, function) - shared across libraries and composers
+_TILE_CACHE: Dict[Tuple[int, LayerSchema, str], SliceTile] = {}
+
+def _intern_tile(width: int, layer_schema: LayerSchema, function: str,
+                 has_internals: bool = True, is_appliance_housing: bool = False) -> SliceTile:
+    """Return the shared tile for this key, creating it on first use."""
+    key = (width, layer_schema, function)
+    tile = _TILE_CACHE.get(key)
+    if tile is None:
+        tile = _TILE_CACHE[key] = SliceTile(
+            width=width,
+            layer_schema=layer_schema,
+            function=function,
+            has_internals=has_internals,
+            is_appliance_housing=is_appliance_housing
+        )
+    return tile
+
+
+@lru_cache(maxsize=32)
+def create_tile_library(layer_schema: LayerSchema) -> Tuple[SliceTile, ...]:
     """
     Creates a library of compatible tiles based on the given layer schema.
     All tiles in the library will have matching seam heights.
+    Memoized per schema - the returned tuple and its (interned) tiles are shared, immutable values.
     """
     tiles = []
     
     # Standard widths
     for width in [20, 30, 40, 60, 80]:
         # Storage tile
-        tiles.append(SliceTile(
-            width=width,
-            layer_schema=layer_schema,
-            function='storage',
-            has_internals=True
-        ))
+        tiles.append(_intern_tile(width, layer_schema, 'storage', has_internals=True))
     
     # Dishwasher (60cm only, full height opening)
     dw_schema = LayerSchema.full_door(85)
-    tiles.append(SliceTile(
-        width=60,
-        layer_schema=dw_schema,
-        function='appliance',
-        has_internals=False,
-        is_appliance_housing=True
-    ))
+    tiles.append(_intern_tile(60, dw_schema, 'appliance',
+                              has_internals=False, is_appliance_housing=True))
     
-    return tiles
+    return tuple(tiles)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SliceSequence:
     """
     A valid sequence of slice tiles that fill a zone.
@@ -79,8 +98,24 @@ class SliceSequence:
         """Check if all tiles have consistent seam heights."""
         if not self.tiles:
             return True
-        reference = self.tiles[0].seam_heights
-        return all(t.seam_heights == reference for t in self.tiles)
+        ref = self.tiles[0].layer_schema
+        ref_seams = ref.seam_heights
+        return all(t.layer_schema is ref or t.layer_schema.seam_heights == ref_seams
+                   for t in self.tiles)
+
+
+def _greedy_fill(widths_desc: List[int], target: int) -> Tuple[List[int], int]:
+    """
+    Greedy decomposition of `target` into the given widths (largest first).
+    Returns (widths used in order, unfilled remainder).
+    """
+    used = []
+    remaining = target
+    for w in widths_desc:
+        count, remaining = divmod(remaining, w)
+        if count:
+            used.extend([w] * int(count))  # divmod gives a float count for float widths
+    return used, remaining
 
 
 class SliceComposer:
@@ -93,7 +128,23 @@ class SliceComposer:
         self.layer_schema = layer_schema
         self.tile_library = create_tile_library(layer_schema)
         
-    def compose(self, required_functions: List[str] = None) -> Optional[SliceSequence]:
+        # Library tiles grouped by function (library order kept) for required placements
+        self._tiles_by_function: Dict[str, List[SliceTile]] = {}
+        for t in self.tile_library:
+            self._tiles_by_function.setdefault(t.function, []).append(t)
+        
+        # Narrowest tile per function - lower bound for any required placement
+        self._min_width_by_function: Dict[str, int] = {
+            func: min(t.width for t in tiles) for func, tiles in self._tiles_by_function.items()
+        }
+        
+        # Storage tiles keyed by width (first in library wins) for the greedy fill
+        self._storage_by_width: Dict[int, SliceTile] = {}
+        for t in self._tiles_by_function.get('storage', ()):
+            self._storage_by_width.setdefault(t.width, t)
+        self._storage_widths_desc = sorted(self._storage_by_width, reverse=True)
+        
+    def compose(self, required_functions: Optional[List[str]] = None) -> Optional[SliceSequence]:
         """
         Fill the target width with compatible tiles.
         
@@ -101,12 +152,18 @@ class SliceComposer:
             required_functions: Functions that must be included (e.g., ['sink', 'cooktop'])
         """
         required_functions = required_functions or []
+        
+        # Bail out before building anything if the required tiles can't fit
+        min_widths = self._min_width_by_function
+        if sum(min_widths.get(func, 0) for func in required_functions) > self.target_width:
+            return None
+        
         sequence = SliceSequence()
         remaining_width = self.target_width
         
         # Phase 1: Place required function tiles first
         for func in required_functions:
-            matching_tiles = [t for t in self.tile_library if t.function == func]
+            matching_tiles = self._tiles_by_function.get(func)
             if matching_tiles:
                 tile = self._select_best_tile(matching_tiles, remaining_width)
                 if tile:
@@ -114,29 +171,16 @@ class SliceComposer:
                     remaining_width -= tile.width
         
         # Phase 2: Fill remaining space with storage tiles
-        storage_tiles = [t for t in self.tile_library if t.function == 'storage']
-        
-        while remaining_width > 0:
-            valid_tiles = [t for t in storage_tiles if t.width <= remaining_width]
-            
-            if not valid_tiles:
-                # Can't fill exactly - need filler
-                if remaining_width >= 5:
-                    # Create custom filler tile
-                    filler = SliceTile(
-                        width=remaining_width,
-                        layer_schema=self.layer_schema,
-                        function='filler',
-                        has_internals=False
-                    )
-                    sequence.tiles.append(filler)
-                remaining_width = 0
-                break
+        # Prefer larger tiles for efficiency - greedy largest-first decomposition
+        if remaining_width > 0:
+            used, remaining_width = _greedy_fill(self._storage_widths_desc, remaining_width)
+            sequence.tiles.extend(self._storage_by_width[w] for w in used)
             
-            # Prefer larger tiles for efficiency
-            tile = max(valid_tiles, key=lambda t: t.width)
-            sequence.tiles.append(tile)
-            remaining_width -= tile.width
+            # Can't fill exactly - need filler
+            if remaining_width >= 5:
+                # Custom filler tile (interned - remainders are < 20cm)
+                sequence.tiles.append(_intern_tile(remaining_width, self.layer_schema, 'filler',
+                                                   has_internals=False))
         
         return sequence if sequence.is_seam_consistent() else None
     
@@ -146,5 +190,4 @@ class SliceComposer:
         if not valid:
             return None
         # Prefer standard widths: 60 > 80 > 40 > others
-        priority = {60: 0, 80: 1, 40: 2, 30: 3, 20: 4}
-        return min(valid, key=lambda t: priority.get(t.width, 10))
+        return min(valid, key=lambda t: _PRIO[t.width] if t.width <= 80 else 10)
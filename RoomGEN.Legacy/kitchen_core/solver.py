@@ -1,8 +1,95 @@
+import copy
+import hashlib
+import json
+import logging
+import os
+from collections import Counter
+from functools import cached_property
+from itertools import chain
 from ortools.sat.python import cp_model
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
 from .geometry import Room
 from .zones import Zone, ZoneFactory
 
+logger = logging.getLogger(__name__)
+
+
+# Tall wishlist types that get their own zone: type -> ZoneFactory method
+_TALL_ZONE_FACTORIES = {
+    'fridge': ZoneFactory.create_fridge_zone,
+    'pantry': ZoneFactory.create_pantry_zone,
+}
+
+# Zone types the zone model pulls to a room edge (and keeps clear of back-wall windows)
+_EDGE_TYPES = frozenset({'fridge', 'pantry'})
+
+# Types a kitchen can have at most one of
+_ONE_OF_A_KIND = ('fridge', 'sink_cabinet', 'stove_cabinet', 'dishwasher')
+
+# Item types that are always tall units (Monolith), whatever their declared height
+_TALL_TYPES = frozenset({'fridge', 'pantry', 'oven_tower'})
+
+
+def _sum_widths(items: List[Dict], default: int = 60):
+    """Total width (cm) of wishlist items / volumes; a missing width counts as `default`."""
+    return sum(item.get('width', default) for item in items)
+
+
+def _optimal_zone_widths(zones: List[Zone], range_w: int) -> Optional[List[int]]:
+    """
+    Closed-form widths minimizing the zone model objective (10/cm off ideal for
+    non-hard zones, 100/cm of gap) when zones are free to sit anywhere in range_w.
+    
+    Every cm of width saves 100 of gap and costs at most 10, so the total is maximized.
+    Width is handed out cheapest first from all-min: up to ideal for elastic zones (-10),
+    then hard zone slack (0), then past ideal (+10). Returns None if the mins don't fit.
+    """
+    widths = [z.min_width for z in zones]
+    extra = range_w - sum(widths)
+    if extra < 0:
+        return None
+    
+    hard = [z.compressibility == 'hard' for z in zones]
+    tiers = (
+        [(i, min(z.ideal_width, z.max_width)) for i, z in enumerate(zones) if not hard[i]],
+        [(i, z.max_width) for i, z in enumerate(zones) if hard[i]],
+        [(i, z.max_width) for i, z in enumerate(zones) if not hard[i]],
+    )
+    for tier in tiers:
+        for i, cap in tier:
+            if extra <= 0:
+                return widths
+            grow = min(max(cap - widths[i], 0), extra)
+            widths[i] += grow
+            extra -= grow
+    return widths
+
+
+def _zone_widths_penalty(zones: List[Zone], widths: List[int], range_w: int) -> int:
+    """Ideal-width + gap part of the zone model objective for the given widths."""
+    deviation = sum(abs(w - z.ideal_width) for z, w in zip(zones, widths) if z.compressibility != 'hard')
+    return deviation * 10 + (range_w - sum(widths)) * 100
+
+
+def _twin_indices(zones: List[Zone]) -> List[int]:
+    """Index of each zone's next identical zone (-1 if none) - used for symmetry breaking."""
+    twins = []
+    for i, z in enumerate(zones):
+        twins.append(next((j for j in range(i + 1, len(zones)) if zones[j] == z), -1))
+    return twins
+
+
+def _apply_small_model_params(params) -> None:
+    """
+    CP-SAT settings for the tiny zone models (< 20 IntVars, no LP structure):
+    presolve, linearization and probing don't pay for themselves at this size.
+    """
+    params.cp_model_presolve = False
+    params.linearization_level = 0
+    params.cp_model_probing_level = 0
+    params.num_workers = 1
+    params.max_time_in_seconds = 2.0  # Safety cap
+
 
 class StorageValidator:
     """
@@ -24,8 +111,9 @@ class StorageValidator:
         self.room = room
         self.room_area_m2 = (room.width * room.length) / 10000  # cm² to m²
     
-    def calculate_requirements(self) -> Dict[str, float]:
-        """Calculate storage requirements based on room area."""
+    @cached_property
+    def requirements(self) -> Dict[str, float]:
+        """Storage requirements based on room area (computed once per validator, read-only)."""
         target = max(self.room_area_m2 * self.RATIO, self.MIN_TOTAL)
         
         return {
@@ -36,16 +124,20 @@ class StorageValidator:
             'suggest_island': self.room_area_m2 >= self.ISLAND_THRESHOLD
         }
     
+    def calculate_requirements(self) -> Dict[str, float]:
+        """Calculate storage requirements based on room area."""
+        return dict(self.requirements)
+    
     def evaluate_solution(self, skeleton: Dict[str, Any]) -> Dict[str, Any]:
         """Evaluate if the solution meets storage requirements."""
-        requirements = self.calculate_requirements()
+        requirements = self.requirements
         
         # Sum widths of all units (convert cm to m)
         volumes = skeleton.get('volumes', [])
         wall_items = skeleton.get('wall_wishlist', [])
         
-        base_m = sum(v.get('width', 0) for v in volumes) / 100
-        wall_m = sum(v.get('width', 0) for v in wall_items) / 100
+        base_m = _sum_widths(volumes, 0) / 100
+        wall_m = _sum_widths(wall_items, 0) / 100
         total_m = base_m + wall_m
         
         target = requirements['target_linear_m']
@@ -61,11 +153,12 @@ class StorageValidator:
         
         return {
             'room_area_m2': requirements['room_area_m2'],
-            'target_linear_m': round(target, 1),
-            'actual_base_m': round(base_m, 1),
-            'actual_wall_m': round(wall_m, 1),
-            'actual_total_m': round(total_m, 1),
-            'deficit_m': round(deficit, 1),
+            # Unrounded - formatting to 0.1m is left to print_report / consumers
+            'target_linear_m': target,
+            'actual_base_m': base_m,
+            'actual_wall_m': wall_m,
+            'actual_total_m': total_m,
+            'deficit_m': deficit,
             'status': status,
             'recommendation': recommendation,
             'suggest_island': requirements['suggest_island']
@@ -155,6 +248,8 @@ class WishlistExpander:
         self.room = room
         self.room_width = int(room.width)
         self.room_area_m2 = (room.width * room.length) / 10000
+        # Total base width (cm) of the last expanded wishlist - reusable by later stages
+        self.base_width = None
     
     def expand(self, user_wishlist: List[Dict], user_wall_wishlist: List[Dict] = None) -> tuple:
         """
@@ -164,19 +259,19 @@ class WishlistExpander:
         """
         user_wall_wishlist = user_wall_wishlist or []
         
-        expanded = [dict(item) for item in user_wishlist]  # Copy
-        expanded_wall = [dict(item) for item in user_wall_wishlist]
+        # New lists sharing the input items - items are never mutated, only appended
+        expanded = list(user_wishlist)
+        expanded_wall = list(user_wall_wishlist)
         
-        print("\n[WishlistExpander] Smart Fill...")
-        print(f"  Input: {len(user_wishlist)} base, {len(user_wall_wishlist)} wall items")
+        logger.info("\n[WishlistExpander] Smart Fill...")
+        logger.info("  Input: %d base, %d wall items", len(user_wishlist), len(user_wall_wishlist))
         
         # Track what types we have
         base_types = {item['type'] for item in expanded}
         wall_types = {item['type'] for item in expanded_wall}
         
-        # Step 1: Ensure mandatory zones have items
+        # Step 1: Ensure mandatory zones have items (updates base_types in place)
         expanded = self._ensure_zones(expanded, base_types)
-        base_types = {item['type'] for item in expanded}
         
         # Step 2: Auto-add dependent items (e.g., hood for stove)
         expanded_wall = self._ensure_auto_items(expanded, expanded_wall, base_types, wall_types)
@@ -184,25 +279,26 @@ class WishlistExpander:
         # Step 3: Fill to meet Storage Index (with SAFETY VALVE)
         expanded = self._fill_storage_safe(expanded)
         
-        print(f"  Output: {len(expanded)} base, {len(expanded_wall)} wall items")
+        logger.info("  Output: %d base, %d wall items", len(expanded), len(expanded_wall))
         
         return expanded, expanded_wall
     
     def _ensure_zones(self, wishlist: List[Dict], existing_types: set) -> List[Dict]:
-        """Ensure each mandatory zone has at least one item."""
+        """Ensure each mandatory zone has at least one item. Added types go into existing_types."""
         for zone, valid_items in self.ZONE_REQUIREMENTS.items():
             if not any(t in existing_types for t in valid_items):
                 # Add default item for this zone
                 default_type = valid_items[0]
                 default_spec = self.DEFAULT_ITEMS.get(default_type, {'width': 60})
                 
-                print(f"  [AUTO] Adding {default_type} for {zone} zone")
+                logger.info("  [AUTO] Adding %s for %s zone", default_type, zone)
                 wishlist.append({
                     'type': default_type,
                     'width': default_spec.get('width', 60),
                     'height': default_spec.get('height', 85),
                     'auto': True
                 })
+                existing_types.add(default_type)
         
         return wishlist
     
@@ -217,7 +313,7 @@ class WishlistExpander:
                 target_types = wall_types if rule.get('is_wall') else base_types
                 if item_type not in target_types:
                     spec = self.DEFAULT_ITEMS.get(item_type, {'width': 60})
-                    print(f"  [AUTO] Adding {item_type} (requires {required})")
+                    logger.info("  [AUTO] Adding %s (requires %s)", item_type, required)
                     
                     new_item = {
                         'type': item_type,
@@ -239,7 +335,7 @@ class WishlistExpander:
         Never exceeds: room_width - SAFETY_BUFFER
         """
         # Calculate current width
-        current_width = sum(item.get('width', 60) for item in wishlist)
+        current_width = _sum_widths(wishlist)
         max_width = self.room_width - self.SAFETY_BUFFER
         
         # Calculate target (Storage Index)
@@ -249,17 +345,19 @@ class WishlistExpander:
         # Calculate deficit
         deficit = target_width - current_width
         
-        print(f"  Storage: current={current_width}cm, target={target_width:.0f}cm, max={max_width}cm")
+        logger.info("  Storage: current=%scm, target=%.0fcm, max=%scm", current_width, target_width, max_width)
         
         # SAFETY VALVE: Can we add anything?
         available_space = max_width - current_width
         
+        self.base_width = current_width
+        
         if deficit <= 0:
-            print(f"  [OK] Storage Index already met")
+            logger.info("  [OK] Storage Index already met")
             return wishlist
         
         if available_space < 30:
-            print(f"  [SAFETY] No room for more cabinets (only {available_space}cm available)")
+            logger.warning("  [SAFETY] No room for more cabinets (only %scm available)", available_space)
             return wishlist
         
         # Fill with drawer cabinets
@@ -270,21 +368,21 @@ class WishlistExpander:
         )
         
         if items_to_add > 0:
-            print(f"  [FILL] Adding {items_to_add} x drawer_cabinet (60cm each)")
-            for _ in range(items_to_add):
-                wishlist.append({
-                    'type': 'drawer_cabinet',
-                    'width': filler_width,
-                    'height': 85,
-                    'auto': True
-                })
+            logger.info("  [FILL] Adding %d x drawer_cabinet (60cm each)", items_to_add)
+            wishlist.extend({
+                'type': 'drawer_cabinet',
+                'width': filler_width,
+                'height': 85,
+                'auto': True
+            } for _ in range(items_to_add))
         
         # Final check
-        final_width = sum(item.get('width', 60) for item in wishlist)
+        final_width = current_width + filler_width * items_to_add
+        self.base_width = final_width
         remaining_deficit = target_width - final_width
         
         if remaining_deficit > 0:
-            print(f"  [WARNING] Still {remaining_deficit:.0f}cm short of Storage Index (room too small)")
+            logger.warning("  [WARNING] Still %.0fcm short of Storage Index (room too small)", remaining_deficit)
         
         return wishlist
 
@@ -303,17 +401,34 @@ class WorkflowSolver:
     - Secondary zone for overflow
     """
     
+    # Map item types to zones
+    ZONE_ITEM_MAP = {
+        'storage': frozenset({'fridge', 'pantry', 'oven_tower'}),
+        'wet': frozenset({'sink_cabinet', 'dishwasher'}),
+        'hot': frozenset({'stove_cabinet'}),
+        'prep': frozenset({'drawer_cabinet'}),
+        'landing': frozenset({'drawer_cabinet'}),
+        'secondary': frozenset({'drawer_cabinet', 'coffee_station', 'wine_rack'}),
+    }
+    
+    # Reverse map: item type -> every zone type it may be placed in
+    TYPE_TO_ZONES = {}
+    for _zone_type, _item_types in ZONE_ITEM_MAP.items():
+        for _item_type in _item_types:
+            TYPE_TO_ZONES.setdefault(_item_type, []).append(_zone_type)
+    del _zone_type, _item_types, _item_type
+    
+    # Tall units that always form a monolith
+    MONOLITH_TYPES = _TALL_TYPES | {'pull_out_pantry'}
+    
     def __init__(self, room: Room):
         self.room = room
         self.water_x = self._get_water_position()
     
     def _get_water_position(self) -> int:
-        """Get water supply X position from room utilities."""
-        for u in self.room.utilities:
-            if u.get('type') == 'water':
-                return int(u.get('x', self.room.width / 2))
-        # Default to center if no water defined
-        return int(self.room.width / 2)
+        """Get water supply X position from room utilities (first water, else room center)."""
+        center = self.room.width / 2
+        return int(next((u.get('x', center) for u in self.room.utilities if u.get('type') == 'water'), center))
     
     def solve_workflow(self, wishlist: List[Dict]) -> Dict[str, Any]:
         """
@@ -325,21 +440,27 @@ class WorkflowSolver:
         
         room_width = int(self.room.width)
         
-        print(f"\n[Workflow Solver] Room: {room_width}cm, Water at: {self.water_x}cm")
+        logger.info("\n[Workflow Solver] Room: %scm, Water at: %scm", room_width, self.water_x)
         
         # === STEP 1: Determine what we have ===
-        has_fridge = any(i['type'] == 'fridge' for i in wishlist)
-        has_pantry = any(i['type'] == 'pantry' for i in wishlist)
-        has_sink = any(i['type'] == 'sink_cabinet' for i in wishlist)
-        has_dw = any(i['type'] == 'dishwasher' for i in wishlist)
-        has_stove = any(i['type'] == 'stove_cabinet' for i in wishlist)
+        # One pass: width of the first item of each type
+        type_widths = {}
+        for i in wishlist:
+            if i['type'] not in type_widths:
+                type_widths[i['type']] = i.get('width')
+        
+        has_fridge = 'fridge' in type_widths
+        has_pantry = 'pantry' in type_widths
+        has_sink = 'sink_cabinet' in type_widths
+        has_dw = 'dishwasher' in type_widths
+        has_stove = 'stove_cabinet' in type_widths
         
         # Get widths
-        fridge_w = next((i['width'] for i in wishlist if i['type'] == 'fridge'), 0)
-        pantry_w = next((i['width'] for i in wishlist if i['type'] == 'pantry'), 0)
-        sink_w = next((i['width'] for i in wishlist if i['type'] == 'sink_cabinet'), 60)
-        dw_w = next((i['width'] for i in wishlist if i['type'] == 'dishwasher'), 0)
-        stove_w = next((i['width'] for i in wishlist if i['type'] == 'stove_cabinet'), 60)
+        fridge_w = type_widths.get('fridge', 0)
+        pantry_w = type_widths.get('pantry', 0)
+        sink_w = type_widths.get('sink_cabinet', 60)
+        dw_w = type_widths.get('dishwasher', 0)
+        stove_w = type_widths.get('stove_cabinet', 60)
         
         # === STEP 2: Calculate zone widths ===
         storage_w = fridge_w + pantry_w
@@ -353,27 +474,27 @@ class WorkflowSolver:
         if self.water_x < room_width / 2:
             sequence = 'B'  # Storage on right: Landing-Hot-Prep-Wet-Landing-Storage
             storage_side = 'right'
-            print(f"  Polarity: Water LEFT -> Storage RIGHT (Sequence B)")
+            logger.info("  Polarity: Water LEFT -> Storage RIGHT (Sequence B)")
         else:
             sequence = 'A'  # Storage on left: Storage-Landing-Wet-Prep-Hot-Landing
             storage_side = 'left'
-            print(f"  Polarity: Water RIGHT -> Storage LEFT (Sequence A)")
+            logger.info("  Polarity: Water RIGHT -> Storage LEFT (Sequence A)")
         
         # === STEP 4: Calculate PREP (elastic zone) ===
         fixed_total = storage_w + 2*landing_w + wet_w + hot_w + hot_padding
         prep_available = room_width - fixed_total
         
-        print(f"  Fixed zones: {fixed_total}cm, Prep available: {prep_available}cm")
+        logger.info("  Fixed zones: %scm, Prep available: %scm", fixed_total, prep_available)
         
         # Validate
         if prep_available < 60:
-            print(f"  [CRITICAL] Prep zone too small ({prep_available}cm < 60cm)!")
+            logger.warning("  [CRITICAL] Prep zone too small (%scm < 60cm)!", prep_available)
             prep_w = max(30, prep_available)  # Emergency minimum
             secondary_w = 0
         elif prep_available > 140:
             prep_w = 110  # Ideal
             secondary_w = prep_available - 110
-            print(f"  [OVERFLOW] Creating Secondary zone: {secondary_w}cm")
+            logger.info("  [OVERFLOW] Creating Secondary zone: %scm", secondary_w)
         else:
             prep_w = prep_available
             secondary_w = 0
@@ -439,61 +560,64 @@ class WorkflowSolver:
                              'content': ['fridge', 'pantry'] if has_pantry else ['fridge']})
                 current_x += storage_w
         
-        # Print layout
-        print(f"\n  Zone Layout:")
-        for z in zones:
-            print(f"    {z['type'].upper():10} {z['x']:4}-{z['x']+z['width']:<4} ({z['width']}cm)")
+        # Log layout (table only formatted when someone is listening)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("\n  Zone Layout:\n%s", "\n".join(
+                f"    {z['type'].upper():10} {z['x']:4}-{z['x']+z['width']:<4} ({z['width']}cm)"
+                for z in zones
+            ))
         
         # Build volumes by expanding zones into actual items from wishlist
         volumes = []
         
-        # Map item types to zones
-        zone_item_map = {
-            'storage': ['fridge', 'pantry', 'oven_tower'],
-            'wet': ['sink_cabinet', 'dishwasher'],
-            'hot': ['stove_cabinet'],
-            'prep': ['drawer_cabinet'],
-            'landing': ['drawer_cabinet'],
-            'secondary': ['drawer_cabinet', 'coffee_station', 'wine_rack'],
-        }
+        # Bucket wishlist items by zone type in one pass (wishlist order kept per bucket)
+        type_to_zones = self.TYPE_TO_ZONES
+        zone_buckets = {}
+        for item in wishlist:
+            for zone_type in type_to_zones.get(item['type'], ()):
+                zone_buckets.setdefault(zone_type, []).append(item)
         
+        monolith_types = self.MONOLITH_TYPES
+        add_volume = volumes.append
         for z in zones:
             zone_type = z['type']
             zone_x = z['x']
             zone_w = z['width']
             
             # Get items that belong to this zone
-            zone_items = [item for item in wishlist 
-                         if item['type'] in zone_item_map.get(zone_type, [])]
+            zone_items = zone_buckets.get(zone_type)
             
             if zone_items:
                 # Place actual items from wishlist
                 item_x = zone_x
+                zone_limit = zone_x + zone_w + 5  # Slight tolerance
                 for item in zone_items:
                     item_w = item.get('width', 60)
+                    if item_x + item_w > zone_limit:
+                        continue
+                    
                     item_h = item.get('height', 85)
                     item_type = item['type']
                     
                     # Detect monolith (tall units)
-                    is_monolith = item_type in ['fridge', 'pantry', 'oven_tower', 'pull_out_pantry'] or item_h > 150
+                    is_monolith = item_type in monolith_types or item_h > 150
                     
-                    if item_x + item_w <= zone_x + zone_w + 5:  # Slight tolerance
-                        volumes.append({
-                            'x': item_x,
-                            'width': item_w,
-                            'function': item_type,  # Actual item type!
-                            'metadata': {
-                                'zone_type': zone_type,
-                                'height': item_h,
-                                'is_monolith': is_monolith
-                            }
-                        })
-                        item_x += item_w
+                    add_volume({
+                        'x': item_x,
+                        'width': item_w,
+                        'function': item_type,  # Actual item type!
+                        'metadata': {
+                            'zone_type': zone_type,
+                            'height': item_h,
+                            'is_monolith': is_monolith
+                        }
+                    })
+                    item_x += item_w
                 
                 # Fill remaining zone space with default
                 remaining = zone_x + zone_w - item_x
                 if remaining >= 20:
-                    volumes.append({
+                    add_volume({
                         'x': item_x,
                         'width': remaining,
                         'function': 'drawer_cabinet',
@@ -501,7 +625,7 @@ class WorkflowSolver:
                     })
             else:
                 # No specific items for this zone - use zone type as function
-                volumes.append({
+                add_volume({
                     'x': zone_x,
                     'width': zone_w,
                     'function': zone_type,
@@ -520,49 +644,92 @@ class WorkflowSolver:
 
 
 class KitchenSolver:
-    def __init__(self, room: Room):
+    # Max files kept in the on-disk solution cache (oldest evicted first)
+    SOLUTION_CACHE_MAX_FILES = 1000
+    # Part of every solution cache key - bump when a solver change alters results,
+    # so skeletons stored by an older version are never served
+    SOLUTION_CACHE_VERSION = 1
+    
+    def __init__(self, room: Room, num_workers: Optional[int] = None, cache_dir: Optional[str] = None,
+                 cache: bool = False):
+        """
+        cache_dir: directory for persisting solve() results across runs as JSON
+                   (e.g. ~/.cache/roomdesigner/solutions). None disables it.
+        cache: keep solve() results in memory for repeated wishlists (opt-in - call
+               clear_cache() after editing the room).
+        """
         self.room = room
+        self.cache_dir = os.path.expanduser(cache_dir) if cache_dir else None
+        self.cache = cache
+        self._solution_cache: Dict[str, Optional[Dict[str, Any]]] = {}
         self.model = cp_model.CpModel()
         self.solver = cp_model.CpSolver()
         
+        # Parallel portfolio for optimum searches (enumeration runs single-worker separately)
+        params = self.solver.parameters
+        params.num_workers = num_workers or os.cpu_count() or 8
+        params.log_search_progress = False
+        params.linearization_level = 2
+        params.cp_model_presolve = True
+        params.repair_hint = True
+        
+        # Reused solvers (parameters set once): small-model optimum search, enumeration
+        self._fast_solver = cp_model.CpSolver()
+        _apply_small_model_params(self._fast_solver.parameters)
+        self._fast_solver.parameters.repair_hint = True
+        self._enum_solver = cp_model.CpSolver()
+        self._enum_solver.parameters.enumerate_all_solutions = True
+        
+        # Back-wall windows/doors as (x, end, sill) - tall zones must not cover them
+        self._forbidden_intervals = tuple(
+            (f['x'], f['x'] + f['width'], f.get('y', 0))
+            for f in (room.windows or []) + (room.doors or [])
+            if f.get('wall') == 'back'
+        )
+        
+        # Built zone models keyed by zone signature (see _build_zone_model)
+        self._model_cache: Dict[tuple, tuple] = {}
+        
     def create_zones_from_wishlist(self, wishlist: List[Dict]) -> List[Zone]:
         """
         Phase 1: Convert Item Wishlist into Functional Zones (Elastic Architecture).
         """
         zones = []
         
-        # Analyze content
+        # Analyze content in one pass: counts, first width per type, tall zones, base cabinets
         counts = {}
+        first_widths = {}
+        base_cabs = []
+        tall_factories = _TALL_ZONE_FACTORIES
         for item in wishlist:
             t = item['type']
             counts[t] = counts.get(t, 0) + 1
+            if t not in first_widths:
+                first_widths[t] = item.get('width')
             
-        # 1. Tall Zones (Fridge, Pantry) - Separate Zones
-        # They usually anchor edges.
-        for item in wishlist:
-            if item['type'] == 'fridge':
-                zones.append(ZoneFactory.create_fridge_zone(width=item['width'], height=item.get('height', 215)))
-            elif item['type'] == 'pantry':
-                z = ZoneFactory.create_fridge_zone(width=item['width'], height=item.get('height', 215))
-                z.type = 'pantry'
-                zones.append(z)
+            # 1. Tall Zones (Fridge, Pantry) - Separate Zones
+            # They usually anchor edges.
+            factory = tall_factories.get(t)
+            if factory is not None:
+                zones.append(factory(width=item['width'], height=item.get('height', 215)))
+            elif t == 'base_cabinet':
+                base_cabs.append(item)
                 
         # 2. Wet Zone (Sink + Dishwasher)
         has_sink = counts.get('sink_cabinet', 0) > 0
         has_dw = counts.get('dishwasher', 0) > 0
         
         if has_sink:
-            sink_w = next(i['width'] for i in wishlist if i['type'] == 'sink_cabinet')
-            dw_w = next(i['width'] for i in wishlist if i['type'] == 'dishwasher') if has_dw else 0
+            sink_w = first_widths['sink_cabinet']
+            dw_w = first_widths['dishwasher'] if has_dw else 0
             zones.append(ZoneFactory.create_wet_zone(sink_w, dw_w))
             
         # 3. Cooking Zone (Stove)
         if counts.get('stove_cabinet', 0) > 0:
-            stove_w = next(i['width'] for i in wishlist if i['type'] == 'stove_cabinet')
+            stove_w = first_widths['stove_cabinet']
             zones.append(ZoneFactory.create_cooking_zone(stove_w))
             
         # 4. Prep / Storage Zones
-        base_cabs = [i for i in wishlist if i['type'] == 'base_cabinet']
         for bc in base_cabs:
              # Map each requested base_cabinet to a Prep/Storage zone.
              z = ZoneFactory.create_prep_zone(ideal=bc['width'])
@@ -574,13 +741,15 @@ class KitchenSolver:
     
     # ========== L-SHAPE SUPPORT ==========
     
-    def detect_optimal_shape(self, wishlist: List[Dict]) -> str:
+    def detect_optimal_shape(self, wishlist: List[Dict], total_width: Optional[float] = None) -> str:
         """
         Auto-detect whether I-shape or L-shape is optimal.
         
         Rule: If total item width exceeds 90% of main wall, switch to L.
+        Pass total_width when already known (e.g. WishlistExpander.base_width) to skip the re-sum.
         """
-        total_width = sum(item.get('width', 60) for item in wishlist)
+        if total_width is None:
+            total_width = _sum_widths(wishlist)
         main_wall = int(self.room.width)
         
         # Leave 10% buffer for fillers/gaps
@@ -629,29 +798,31 @@ class KitchenSolver:
         arm_a_length = int(self.room.width) - corner_size  # Main wall (back)
         arm_b_length = int(self.room.wall_b_length or self.room.length) - corner_size  # Side wall
         
-        print(f"  L-Shape: Corner={corner.type}({corner_size}cm)")
-        print(f"  Arm A (back): {arm_a_length}cm, Arm B (side): {arm_b_length}cm")
+        logger.info("  L-Shape: Corner=%s(%scm)", corner.type, corner_size)
+        logger.info("  Arm A (back): %scm, Arm B (side): %scm", arm_a_length, arm_b_length)
         
-        # Classify items
+        # Classify items (single pass - base items are split into wet / other for Arm A ordering)
         tall_items = []
-        base_items = []
+        sink_items = []
+        other_items = []
+        monolith_width = 0
         TALL_THRESHOLD = 150
         
         for item in wishlist:
-            item_h = item.get('height', 85)
-            if item_h > TALL_THRESHOLD or item['type'] in ['fridge', 'pantry', 'oven_tower']:
+            item_type = item['type']
+            if item.get('height', 85) > TALL_THRESHOLD or item_type in _TALL_TYPES:
                 tall_items.append(item)
+                monolith_width += item.get('width', 60)
+            elif item_type in ('sink_cabinet', 'dishwasher', 'wet'):
+                sink_items.append(item)
             else:
-                base_items.append(item)
-        
-        # Calculate Monolith width (at END of Arm B)
-        monolith_width = sum(i.get('width', 60) for i in tall_items)
+                other_items.append(item)
         
         # Arm B available for base cabinets (after reserving space for Monolith at end)
         arm_b_base_length = arm_b_length - monolith_width
         
-        print(f"  Monolith: {monolith_width}cm (at end of Arm B)")
-        print(f"  Arm B base zone: {arm_b_base_length}cm")
+        logger.info("  Monolith: %scm (at end of Arm B)", monolith_width)
+        logger.info("  Arm B base zone: %scm", arm_b_base_length)
         
         # === SOLVE ARM A (Back Wall - Main Workbench) ===
         # Contains: Sink, Cooktop, DW, prep cabinets
@@ -676,9 +847,6 @@ class KitchenSolver:
         ordered_items = []
         
         # 1. Sink & DW
-        sink_items = [i for i in base_items if i['type'] in ['sink_cabinet', 'dishwasher', 'wet']]
-        other_items = [i for i in base_items if i not in sink_items]
-        
         ordered_items.extend(sink_items)
         ordered_items.extend(other_items)
         
@@ -693,7 +861,7 @@ class KitchenSolver:
                 })
                 current_x += w
             else:
-                print(f"  [WARNING] Item {item['type']} ({w}cm) does not fit on Arm A")
+                logger.warning("  [WARNING] Item %s (%scm) does not fit on Arm A", item['type'], w)
         
         # Fill remaining space with filler/prep
         remaining = arm_a_end - current_x
@@ -715,28 +883,30 @@ class KitchenSolver:
         
         # 1. Base cabinets on Arm B (from corner to Monolith)
         if arm_b_base_length > 30:  # Only if there's meaningful space
-            # Simple fill with base cabinets
-            current_z = corner_size
-            while current_z < corner_size + arm_b_base_length - 5:
-                cab_width = min(60, corner_size + arm_b_base_length - current_z)
-                if cab_width < 20:
-                    break
-                arm_b_volumes.append({
-                    'x': 0,
-                    'z': current_z,
-                    'width': cab_width,
-                    'function': 'storage',
-                    'metadata': {'height': 85, 'arm': 'B', 'axis': 'Z'}
-                })
-                current_z += cab_width
+            # Simple fill with base cabinets: full 60s, then the remainder if it is >= 20
+            arm_b_end = corner_size + arm_b_base_length
+            full_cabs, rest = divmod(arm_b_base_length, 60)
+            tiles = [(corner_size + 60 * k, 60) for k in range(int(full_cabs))]
+            if rest >= 20:
+                rest_z = corner_size + 60 * int(full_cabs)
+                tiles.append((rest_z, arm_b_end - rest_z))
+            
+            arm_b_volumes.extend({
+                'x': 0,
+                'z': z,
+                'width': cab_width,
+                'function': 'storage',
+                'metadata': {'height': 85, 'arm': 'B', 'axis': 'Z'}
+            } for z, cab_width in tiles)
         
         # 2. Monolith at END of Arm B (farthest from corner)
         monolith_z = corner_size + arm_b_base_length
         for item in tall_items:
+            item_w = item.get('width', 60)
             arm_b_volumes.append({
                 'x': 0,
                 'z': monolith_z,
-                'width': item.get('width', 60),
+                'width': item_w,
                 'function': item['type'],
                 'metadata': {
                     'height': item.get('height', 215),
@@ -745,7 +915,7 @@ class KitchenSolver:
                     'axis': 'Z'
                 }
             })
-            monolith_z += item.get('width', 60)
+            monolith_z += item_w
         
         # === BUILD SKELETON ===
         skeleton = {
@@ -790,27 +960,27 @@ class KitchenSolver:
                 'monolith_edge': 'left' or 'right'
             }
         """
-        # Classify items by height
+        # Classify items by height and sum the monolith width in the same pass
+        # (the workbench takes whatever the monolith leaves, so its items aren't summed)
         tall_items = []
         base_items = []
+        monolith_width = 0
         
         TALL_THRESHOLD = 150  # cm
         
         for item in wishlist:
-            item_h = item.get('height', 85)
-            if item_h > TALL_THRESHOLD or item['type'] in ['fridge', 'pantry', 'oven_tower']:
+            if item.get('height', 85) > TALL_THRESHOLD or item['type'] in _TALL_TYPES:
                 tall_items.append(item)
+                monolith_width += item.get('width', 60)
             else:
                 base_items.append(item)
         
-        # Calculate required widths
-        monolith_width = sum(i.get('width', 60) for i in tall_items)
-        workbench_width = sum(i.get('width', 60) for i in base_items)
         room_width = int(self.room.width)
         
-        # Decide Monolith edge (prefer left, unless windows block it)
+        # Decide Monolith edge (prefer left, unless windows block it) - stops at the first hit
+        half_width = room_width / 2
         windows_on_left = any(
-            w.get('wall') == 'back' and w.get('x', 0) < room_width / 2 
+            w.get('wall') == 'back' and w.get('x', 0) < half_width
             for w in (self.room.windows or [])
         )
         
@@ -861,8 +1031,8 @@ class KitchenSolver:
         
         # Phase 1: Mass Allocation
         masses = self.solve_masses(wishlist)
-        print(f"  Mass Allocation: Monolith={masses['monolith']['width']}cm on {masses['monolith_edge']}")
-        print(f"  Workbench zone: {masses['workbench']['start']}-{masses['workbench']['end']}cm")
+        logger.debug("  Mass Allocation: Monolith=%scm on %s", masses['monolith']['width'], masses['monolith_edge'])
+        logger.debug("  Workbench zone: %s-%scm", masses['workbench']['start'], masses['workbench']['end'])
         
         # Phase 2: Solve Workbench (using existing zone logic)
         workbench_zones = self.create_zones_from_wishlist(masses['workbench']['items'])
@@ -881,13 +1051,14 @@ class KitchenSolver:
         # Add Monolith items directly (they're rigid blocks)
         monolith_x = masses['monolith']['start']
         for item in masses['monolith']['items']:
+            item_w = item.get('width', 60)
             skeleton['volumes'].append({
                 'x': monolith_x,
-                'width': item.get('width', 60),
+                'width': item_w,
                 'function': item['type'],
                 'metadata': {'height': item.get('height', 215), 'is_monolith': True}
             })
-            monolith_x += item.get('width', 60)
+            monolith_x += item_w
         
         # Attach mass info to skeleton
         skeleton['masses'] = masses
@@ -902,14 +1073,35 @@ class KitchenSolver:
         if not zones:
             return {'volumes': [], 'wall_wishlist': wall_wishlist}
         
+        range_width = end - start
+        
+        # No placement terms in this model - the optimal widths are known in closed form,
+        # so zones are simply packed left to right in order.
+        widths = _optimal_zone_widths(zones, range_width)
+        if widths is None:
+            return None
+        if all(abs(w - z.ideal_width) <= range_width for z, w in zip(zones, widths)):
+            skeleton = {'volumes': []}
+            x = start
+            for z, w in zip(zones, widths):
+                skeleton['volumes'].append({
+                    'x': x,
+                    'width': w,
+                    'function': z.type,
+                    'metadata': z.metadata
+                })
+                x += w
+            skeleton['wall_wishlist'] = wall_wishlist
+            return skeleton
+        
         model = cp_model.CpModel()
         zone_vars = {}
-        range_width = end - start
         
         for i, z in enumerate(zones):
             w_var = model.NewIntVar(z.min_width, z.max_width, f'z_{i}_width')
-            s_var = model.NewIntVar(0, range_width, f'z_{i}_start')
-            e_var = model.NewIntVar(0, range_width, f'z_{i}_end')
+            # Tight domains: a zone starts early enough and ends late enough to hold min_width
+            s_var = model.NewIntVar(0, max(range_width - z.min_width, 0), f'z_{i}_start')
+            e_var = model.NewIntVar(min(z.min_width, range_width), range_width, f'z_{i}_end')
             inv_var = model.NewIntervalVar(s_var, w_var, e_var, f'z_{i}_inv')
             
             zone_vars[i] = {
@@ -925,41 +1117,32 @@ class KitchenSolver:
         for v in zone_vars.values():
             model.Add(v['end'] <= range_width)
         
+        # Identical zones are interchangeable - fix their order
+        for i, j in enumerate(_twin_indices(zones)):
+            if j >= 0:
+                model.Add(zone_vars[i]['end'] <= zone_vars[j]['start'])
+        
         # Penalties
         penalties = []
         for i, v in zone_vars.items():
             z = v['zone']
             if z.compressibility != 'hard':
                 diff = model.NewIntVar(0, range_width, f'diff_{i}')
-                model.Add(diff >= v['width'] - z.ideal_width)
-                model.Add(diff >= z.ideal_width - v['width'])
+                model.AddAbsEquality(diff, v['width'] - z.ideal_width)
                 penalties.append(diff * 10)
         
-        # Gap minimization
-        total_width = model.NewIntVar(0, range_width * 2, 'total_width')
-        model.Add(total_width == sum(v['width'] for v in zone_vars.values()))
+        # Gap minimization (gap >= 0 already caps the width sum at the range)
         gap = model.NewIntVar(0, range_width, 'gap')
-        model.Add(gap == range_width - total_width)
-        model.Add(total_width <= range_width)
+        model.Add(gap == range_width - sum(v['width'] for v in zone_vars.values()))
         penalties.append(gap * 100)
         
         model.Minimize(sum(penalties))
         
-        solver = cp_model.CpSolver()
+        solver = self._fast_solver
         status = solver.Solve(model)
         
         if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
-            skeleton = {'volumes': []}
-            for i, v in zone_vars.items():
-                z = v['zone']
-                skeleton['volumes'].append({
-                    'x': start + solver.Value(v['start']),  # Offset by range start
-                    'width': solver.Value(v['width']),
-                    'function': z.type,
-                    'metadata': z.metadata
-                })
-            skeleton['wall_wishlist'] = wall_wishlist
-            return skeleton
+            return self._extract_skeleton(zone_vars, solver, start, wall_wishlist)  # Offset by range start
         
         return None
         
@@ -967,21 +1150,18 @@ class KitchenSolver:
         """
         Enforce cardinality rules.
         """
-        counts = {}
-        for item in wishlist + (wall_wishlist or []):
-            t = item['type']
-            counts[t] = counts.get(t, 0) + 1
+        # One C-level counting pass over both lists (no concatenated copy)
+        counts = Counter(item['type'] for item in chain(wishlist, wall_wishlist or ()))
             
-        one_of_a_kind = ['fridge', 'sink_cabinet', 'stove_cabinet', 'dishwasher']
-        for t in one_of_a_kind:
-            if counts.get(t, 0) > 1:
+        for t in _ONE_OF_A_KIND:
+            if counts[t] > 1:
                 raise ValueError(f"Validation Error: You can have at most ONE '{t}'. Found {counts[t]}.")
                 
-        stoves = counts.get('stove_cabinet', 0)
-        hoods = counts.get('hood', 0)
+        stoves = counts['stove_cabinet']
+        hoods = counts['hood']
         
         if stoves > 0 and hoods == 0:
-            print("Warning: Stove present without Hood.")
+            logger.warning("Warning: Stove present without Hood.")
         
         if hoods > stoves:
              raise ValueError(f"Found {hoods} hoods but only {stoves} stoves. Cannot have more hoods than stoves.")
@@ -991,42 +1171,162 @@ class KitchenSolver:
         New V2 Solve: Elastic Zones.
         Returns a 'Skeleton' dictionary describing functional volumes.
         """
-        # Default behavior: Return optimal
-        skeletons = self.solve_scenarios(wishlist, wall_wishlist, limit=1)
-        return skeletons[0] if skeletons else None
+        if not self.cache and self.cache_dir is None:
+            skeletons = self.solve_scenarios(wishlist, wall_wishlist, limit=1)
+            return skeletons[0] if skeletons else None
+        
+        key = self._solution_key(wishlist, wall_wishlist)
+        if self.cache and key in self._solution_cache:
+            return copy.deepcopy(self._solution_cache[key])
+        
+        cache_path = os.path.join(self.cache_dir, f"{key}.json") if self.cache_dir else None
+        skeleton = None
+        if cache_path is not None and os.path.exists(cache_path):
+            try:
+                with open(cache_path, 'r') as f:
+                    skeleton = json.load(f)
+            except (OSError, ValueError):
+                pass  # Unreadable entry - solve again and overwrite it
+        
+        if skeleton is None:
+            # Default behavior: Return optimal
+            skeletons = self.solve_scenarios(wishlist, wall_wishlist, limit=1)
+            skeleton = skeletons[0] if skeletons else None
+            if cache_path is not None and skeleton is not None:
+                self._store_solution(cache_path, skeleton)
+        
+        if self.cache:
+            # Callers may edit the skeleton - the cache keeps its own copy
+            self._solution_cache[key] = copy.deepcopy(skeleton)
+        return skeleton
+    
+    def clear_cache(self):
+        """Drop in-memory solve() results and built zone models (e.g. after editing the room)."""
+        self._solution_cache.clear()
+        self._model_cache.clear()
+    
+    def _solution_key(self, wishlist: List[Dict], wall_wishlist: Optional[List[Dict]]) -> str:
+        """Stable hash of the wishlist + the room geometry the solve depends on."""
+        room = self.room
+        payload = json.dumps([self.SOLUTION_CACHE_VERSION, wishlist, wall_wishlist or [], room.width,
+                              room.height, room.slopes, room.windows, room.doors],
+                             sort_keys=True, default=str)
+        return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+    
+    def _store_solution(self, cache_path: str, skeleton: Dict[str, Any]):
+        """Write atomically (temp file + os.replace), then evict the oldest files over the limit."""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(skeleton, f)
+            os.replace(tmp_path, cache_path)
+            
+            entries = [e for e in os.scandir(self.cache_dir) if e.name.endswith('.json')]
+            excess = len(entries) - self.SOLUTION_CACHE_MAX_FILES
+            if excess > 0:
+                entries.sort(key=lambda e: e.stat().st_mtime)
+                for e in entries[:excess]:
+                    os.remove(e.path)
+        except OSError as e:
+            logger.warning("Solution cache write failed: %s", e)
 
-    def solve_scenarios(self, wishlist: List[Dict], wall_wishlist: List[Dict], limit: int = 10) -> List[Dict[str, Any]]:
+    def solve_scenarios(self, wishlist: List[Dict], wall_wishlist: List[Dict], limit: int = 10,
+                        fast_mode: bool = True) -> List[Dict[str, Any]]:
         """
         Generates top N valid layout scenarios for evaluation.
+        fast_mode: single-worker CP-SAT without presolve/probing (see _apply_small_model_params).
         """
         wall_wishlist = wall_wishlist or []
         self.validate_wishlist(wishlist, wall_wishlist)
         base_zones = self.create_zones_from_wishlist(wishlist)
         
-        return self.solve_zones_multiple(base_zones, wall_wishlist, limit)
+        return self.solve_zones_multiple(base_zones, wall_wishlist, limit, fast_mode=fast_mode)
 
+    def _active_forbidden_intervals(self, base_zones: List[Zone]) -> List[Tuple[int, int, int]]:
+        """
+        Back-wall windows/doors as (x, end, sill), keeping only those whose sill is below
+        the tallest fridge/pantry zone - lower ones can't block anything.
+        """
+        max_tall_h = max((z.metadata.get('height', 215) for z in base_zones if z.type in _EDGE_TYPES), default=0)
+        return [fi for fi in self._forbidden_intervals if fi[2] < max_tall_h]
+    
+    def _preprocess_domains(self, base_zones: List[Zone], room_w: int) -> Dict[int, List[Tuple[int, int]]]:
+        """
+        Fold the ceiling-clearance (slope) constraint of tall zones into start domains.
+        
+        Returns {zone index: [(lo, hi), ...]} of allowed start positions, only for zones a
+        slope actually restricts. An empty list means the zone fits nowhere.
+        Checked at min_width: the ceiling is a minimum of linear functions, so the clear
+        stretch is one interval [a, b] and a zone fits iff start >= a and end <= b - the
+        model bounds the end by the same intervals shifted by min_width.
+        """
+        if not self.room.slopes:
+            return {}
+        domains = {}
+        for i, z in enumerate(base_zones):
+            if z.type not in _EDGE_TYPES:
+                continue
+            valid = self.room.get_valid_x_intervals(z.min_width, z.metadata.get('height', 215))
+            if valid != [(0, room_w - z.min_width)]:
+                domains[i] = valid
+        return domains
+    
     def _build_zone_model(self, base_zones, room_w):
         """
         Internal: Builds the CP Model for Zones.
         Returns (model, zone_vars, objective_expr)
+        
+        Models are cached by zone signature - a repeat solve clones the cached
+        model instead of rebuilding every variable and constraint.
         """
+        # 0. Forbidden Zones (only features some tall zone actually reaches)
+        forbidden_intervals = self._active_forbidden_intervals(base_zones)
+        
+        # Everything the model depends on: bounds, tall heights vs sills, twin chaining
+        twins = _twin_indices(base_zones)
+        key = (
+            room_w,
+            tuple((z.type, z.min_width, z.max_width, z.ideal_width, z.compressibility,
+                   z.metadata.get('height', 215)) for z in base_zones),
+            tuple(forbidden_intervals),
+            tuple(twins),
+        )
+        cached = self._model_cache.get(key)
+        if cached is not None:
+            template, var_indices, objective_index = cached
+            model = template.clone()
+            zone_vars = {}
+            for i, (z, (s_idx, w_idx, e_idx, inv_idx)) in enumerate(zip(base_zones, var_indices)):
+                zone_vars[i] = {
+                    'zone': z,
+                    'start': model.GetIntVarFromProtoIndex(s_idx),
+                    'end': model.GetIntVarFromProtoIndex(e_idx),
+                    'width': model.GetIntVarFromProtoIndex(w_idx),
+                    'interval': model.GetIntervalVarFromProtoIndex(inv_idx)
+                }
+            return model, zone_vars, model.GetIntVarFromProtoIndex(objective_index)
+        
         model = cp_model.CpModel()
         zone_vars = {}
         
-        # 0. Forbidden Zones
-        forbidden_intervals = []
-        features = (self.room.windows or []) + (self.room.doors or [])
-        for f in features:
-            if f.get('wall') == 'back':
-                forbidden_intervals.append((f['x'], f['x'] + f['width'], f.get('y', 0)))
+        # Unary constraints (ceiling clearance under slopes) folded into start domains
+        start_domains = self._preprocess_domains(base_zones, room_w)
 
         # 1. Base Variables
         for i, z in enumerate(base_zones):
             # Width Variable
             w_var = model.NewIntVar(z.min_width, z.max_width, f'z_{i}_width')
-            # Start/End Variables
-            s_var = model.NewIntVar(0, room_w, f'z_{i}_start')
-            e_var = model.NewIntVar(0, room_w, f'z_{i}_end')
+            # Start/End Variables - tight domains: room for at least min_width
+            if i in start_domains:
+                s_var = model.NewIntVarFromDomain(
+                    cp_model.Domain.FromIntervals([list(iv) for iv in start_domains[i]]), f'z_{i}_start')
+                e_var = model.NewIntVarFromDomain(
+                    cp_model.Domain.FromIntervals([[lo + z.min_width, hi + z.min_width]
+                                                   for lo, hi in start_domains[i]]), f'z_{i}_end')
+            else:
+                s_var = model.NewIntVar(0, max(room_w - z.min_width, 0), f'z_{i}_start')
+                e_var = model.NewIntVar(min(z.min_width, room_w), room_w, f'z_{i}_end')
             # Interval
             inv_var = model.NewIntervalVar(s_var, w_var, e_var, f'z_{i}_inv')
             
@@ -1039,7 +1339,7 @@ class KitchenSolver:
             }
             
             # Forbidden Zone Checks (Hard constraints)
-            if z.type in ['fridge', 'pantry']:
+            if forbidden_intervals and z.type in _EDGE_TYPES:
                 for fx, f_end, sill in forbidden_intervals:
                      if z.metadata.get('height', 215) > sill:
                          before = model.NewBoolVar(f'z_{i}_before_{fx}')
@@ -1052,6 +1352,12 @@ class KitchenSolver:
         model.AddNoOverlap([v['interval'] for v in zone_vars.values()])
         for v in zone_vars.values():
             model.Add(v['end'] <= room_w)
+        
+        # Symmetry breaking: identical zones are interchangeable, so fix their order
+        # (each zone is chained to its next twin - permutations are not new layouts)
+        for i, j in enumerate(twins):
+            if j >= 0:
+                model.Add(zone_vars[i]['end'] <= zone_vars[j]['start'])
 
         penalties = []
 
@@ -1060,23 +1366,20 @@ class KitchenSolver:
             z = v['zone']
             if z.compressibility != 'hard':
                 diff = model.NewIntVar(0, room_w, f'diff_{i}')
-                ideal = z.ideal_width
-                model.Add(diff >= v['width'] - ideal)
-                model.Add(diff >= ideal - v['width'])
-                penalties.append(diff * 10) 
+                # Exact |width - ideal| (two lower bounds would leave diff free to grow during
+                # enumeration - the same layout would come back once per diff value)
+                model.AddAbsEquality(diff, v['width'] - z.ideal_width)
+                penalties.append(diff * 10)
                 
-        # D. Gap Minimization
-        total_width = model.NewIntVar(0, room_w * 2, 'total_width')
-        model.Add(total_width == sum(v['width'] for v in zone_vars.values()))
+        # D. Gap Minimization (gap_total >= 0 already caps the width sum at the room)
         gap_total = model.NewIntVar(0, room_w, 'gap_total')
-        model.Add(gap_total == room_w - total_width)
-        model.Add(total_width <= room_w)
-        penalties.append(gap_total * 100) 
+        model.Add(gap_total == room_w - sum(v['width'] for v in zone_vars.values()))
+        penalties.append(gap_total * 100)
         
         # E. Order / Grouping
         for i, v in zone_vars.items():
             z = v['zone']
-            if z.type in ['fridge', 'pantry']:
+            if z.type in _EDGE_TYPES:
                 dist = model.NewIntVar(0, room_w, f'dist_edge_{i}')
                 rem_space = model.NewIntVar(0, room_w, f'rem_{i}')
                 model.Add(rem_space == room_w - v['end'])
@@ -1087,65 +1390,200 @@ class KitchenSolver:
         total_penalty = model.NewIntVar(0, 1000000, 'total_penalty')
         model.Add(total_penalty == sum(penalties))
         
+        # Callers add hints/objectives to the returned model - cache a pristine copy
+        var_indices = [(v['start'].Index(), v['width'].Index(), v['end'].Index(), v['interval'].Index())
+                       for v in zone_vars.values()]
+        self._model_cache[key] = (model.clone(), var_indices, total_penalty.Index())
+        
         return model, zone_vars, total_penalty
 
-    def solve_zones_multiple(self, base_zones: List[Zone], wall_wishlist: List[Dict], limit: int) -> List[Dict[str, Any]]:
-        room_w = int(self.room.width)
-        model, zone_vars, objective_var = self._build_zone_model(base_zones, room_w)
+    def _closed_form_best_score(self, base_zones: List[Zone], room_w: int) -> Optional[int]:
+        """
+        Exact optimum of the zone model without a solve, or None when CP-SAT is needed.
+        
+        Valid when at most two fridge/pantry zones exist (both fit on an edge -> no edge
+        penalty) and no back-wall feature or slope restricts a tall zone. Returns -1 if infeasible.
+        """
+        if sum(1 for z in base_zones if z.type in _EDGE_TYPES) > 2:
+            return None
+        if self._active_forbidden_intervals(base_zones):
+            return None
+        start_domains = self._preprocess_domains(base_zones, room_w)
+        if any(not d for d in start_domains.values()):
+            return -1  # A tall zone clears the ceiling nowhere
+        if start_domains:
+            return None
         
-        # Step 1: Solve for Optimal to define bounds
-        solver_opt = cp_model.CpSolver()
-        model.Minimize(objective_var)
-        status = solver_opt.Solve(model)
+        widths = _optimal_zone_widths(base_zones, room_w)
+        if widths is None:
+            return -1
+        if any(abs(w - z.ideal_width) > room_w for z, w in zip(base_zones, widths)):
+            return None  # Outside the model's diff domains - let CP-SAT decide
+        score = _zone_widths_penalty(base_zones, widths, room_w)
+        # Keep the model's total_penalty domain semantics (0..1e6)
+        return score if score <= 1000000 else None
+    
+    @staticmethod
+    def _extract_skeleton(zone_vars, solution, start_offset: int, wall_wishlist: List[Dict]) -> Dict[str, Any]:
+        """
+        Skeleton from solved zone variables. `solution` is a CpSolver or a solution
+        callback - anything with Value().
+        """
+        skeleton = {'volumes': []}
+        for v in zone_vars.values():
+            z = v['zone']
+            skeleton['volumes'].append({
+                'x': start_offset + solution.Value(v['start']),
+                'width': solution.Value(v['width']),
+                'function': z.type,
+                'metadata': z.metadata
+            })
+        skeleton['wall_wishlist'] = wall_wishlist
+        return skeleton
+    
+    @staticmethod
+    def _greedy_hint(base_zones: List[Zone], room_w: int) -> Dict[int, Tuple[int, int, int]]:
+        """
+        Heuristic layout {i: (start, width, end)}: closed-form widths, first tall zone at
+        the left edge, other zones packed after it in order, remaining tall zones at the
+        right edge. An infeasible hint is fine - CP-SAT only uses it as a starting point.
+        """
+        widths = _optimal_zone_widths(base_zones, room_w)
+        if widths is None:
+            widths = [max(z.min_width, min(z.ideal_width, z.max_width)) for z in base_zones]
+        
+        tall = [i for i, z in enumerate(base_zones) if z.type in _EDGE_TYPES]
+        left, right = tall[:1], tall[1:]
+        order = left + [i for i in range(len(base_zones)) if i not in tall]
+        
+        hint = {}
+        x = 0
+        for i in order:
+            w = widths[i]
+            start = min(x, max(room_w - w, 0))
+            hint[i] = (start, w, start + w)
+            x = start + w
+        
+        # Right-edge tall zones, packed from the wall inwards
+        end = room_w
+        for i in reversed(right):
+            w = widths[i]
+            start = max(end - w, 0)
+            hint[i] = (start, w, start + w)
+            end = start
+        return hint
+    
+    @classmethod
+    def _add_greedy_hint(cls, model, zone_vars, room_w):
+        """Feed _greedy_hint to the model for the optimum search."""
+        hint = cls._greedy_hint([v['zone'] for v in zone_vars.values()], room_w)
+        for i, v in zone_vars.items():
+            start, w, end = hint[i]
+            model.AddHint(v['start'], start)
+            model.AddHint(v['width'], w)
+            model.AddHint(v['end'], end)
+    
+    def solve_zones_multiple(self, base_zones: List[Zone], wall_wishlist: List[Dict], limit: int,
+                             fast_mode: bool = True) -> List[Dict[str, Any]]:
+        room_w = int(self.room.width)
         
-        if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        # Instant rejections before any model work: zone minimums wider than the room,
+        # or a tall zone taller than the (flat) ceiling - slopes only ever lower it
+        if sum(z.min_width for z in base_zones) > room_w:
             return []
+        room_h = self.room.height
+        if any(z.type in _EDGE_TYPES and z.metadata.get('height', 215) > room_h for z in base_zones):
+            return []
+        
+        # Step 1: Optimal score to define bounds
+        # Closed form when the edge / window terms can't bite, CP-SAT otherwise
+        best_score = self._closed_form_best_score(base_zones, room_w)
+        if best_score is not None and best_score >= 0 and limit == 1:
+            # The greedy layout is optimal here (tall zones on the edges, no windows)
+            logger.debug("Optimal Score: %s", best_score)
+            hint = self._greedy_hint(base_zones, room_w)
+            skeleton = {'volumes': []}
+            for i, z in enumerate(base_zones):
+                start, w, _ = hint[i]
+                skeleton['volumes'].append({
+                    'x': start,
+                    'width': w,
+                    'function': z.type,
+                    'metadata': z.metadata
+                })
+            skeleton['wall_wishlist'] = wall_wishlist
+            return [skeleton]
+        
+        model, zone_vars, objective_var = self._build_zone_model(base_zones, room_w)
+        if best_score is None:
+            # Warm start: greedy layout (tall zones at the edges)
+            self._add_greedy_hint(model, zone_vars, room_w)
+            if fast_mode:
+                solver_opt = self._fast_solver
+            else:
+                solver_opt = self.solver
+            model.Minimize(objective_var)
+            status = solver_opt.Solve(model)
+            
+            if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+                return []
+                
+            best_score = solver_opt.Value(objective_var)
             
-        best_score = solver_opt.Value(objective_var)
-        print(f"Optimal Score: {best_score}")
+            # A single scenario is just the optimum - no enumeration pass
+            if limit == 1:
+                logger.debug("Optimal Score: %s", best_score)
+                return [self._extract_skeleton(zone_vars, solver_opt, 0, wall_wishlist)]
+            
+            # Hints only guide the optimum search - keep enumeration order unbiased
+            model.ClearHints()
+        elif best_score < 0:
+            return []  # Zone minimums exceed the room
+        logger.debug("Optimal Score: %s", best_score)
         
         # Step 2: Enumerate "Good" solutions (within 20% of best)
-        # We need to Clear Objective to enumerate
-        model.Proto().objective.Clear() 
+        # We need to Clear Objective to enumerate (ClearObjective, not Proto().objective.Clear():
+        # an empty objective still counts as one, and CP-SAT stops at the first "optimum")
+        model.ClearObjective()
         # Add constraint: score <= best * 1.5
+        # (not tighter: the chef/critic ranking does not follow the zone score, and a
+        # 1.1x bound leaves it only worse-ranked candidates)
         model.Add(objective_var <= int(best_score * 1.5))
         
         # Prepare enumeration
-        solver_enum = cp_model.CpSolver()
-        solver_enum.parameters.enumerate_all_solutions = True
+        solver_enum = self._enum_solver
         
         class SolutionCollector(cp_model.CpSolverSolutionCallback):
-            def __init__(self, vars_map, limit, wall_wl):
+            """Only records raw solution values - skeletons are built after the search."""
+            def __init__(self, limit):
                 cp_model.CpSolverSolutionCallback.__init__(self)
-                self.vars_map = vars_map
                 self.limit = limit
-                self.wall_wl = wall_wl
-                self.solutions = []
+                self.raw = []
 
             def on_solution_callback(self):
-                if len(self.solutions) >= self.limit:
+                if len(self.raw) >= self.limit:
                     self.StopSearch()
                     return
                 
-                # Extract solution
-                skeleton = {'volumes': []}
-                for i, v in self.vars_map.items():
-                    z = v['zone']
-                    skeleton['volumes'].append({
-                        'x': self.Value(v['start']),
-                        'width': self.Value(v['width']),
-                        'function': z.type,
-                        'metadata': z.metadata
-                    })
-                skeleton['wall_wishlist'] = self.wall_wl
-                # Add score for reference?
-                # score = self.Value(objective_var_ref) # Not accessible easily unless passed
-                self.solutions.append(skeleton)
+                # Whole assignment in one call, indexed by proto variable index
+                self.raw.append(self.response_proto.solution)
+                if len(self.raw) >= self.limit:
+                    # Done - don't search on for a solution that would be dropped
+                    self.StopSearch()
                 
-        collector = SolutionCollector(zone_vars, limit, wall_wishlist)
+        collector = SolutionCollector(limit)
         solver_enum.Solve(model, collector)
         
-        return collector.solutions
+        layout = [(v['zone'], v['start'].Index(), v['width'].Index()) for v in zone_vars.values()]
+        solutions = []
+        for values in collector.raw:
+            skeleton = {'volumes': [
+                {'x': values[s_idx], 'width': values[w_idx], 'function': z.type, 'metadata': z.metadata}
+                for z, s_idx, w_idx in layout
+            ]}
+            skeleton['wall_wishlist'] = wall_wishlist
+            solutions.append(skeleton)
+        return solutions
 
     # Legacy method for compatibility if needed, but we rerouted solve()
     def solve_zones(self, base_zones, wall_wishlist):
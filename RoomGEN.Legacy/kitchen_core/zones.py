@@ -67,7 +67,7 @@ WORKFLOW_SEQUENCE_B = [
 ]
 
 
-@dataclass
+@dataclass(slots=True)
 class Zone:
     type: str  # 'wet', 'cooking', 'prep', 'storage', 'fridge', 'pantry', 'filler'
     min_width: int
@@ -120,6 +120,13 @@ class ZoneFactory:
             metadata={'height': height}
         )
 
+    @staticmethod
+    def create_pantry_zone(width=60, height=215) -> 'Zone':
+        # Tall unit placed like a fridge (same rigid zone, own type)
+        z = ZoneFactory.create_fridge_zone(width=width, height=height)
+        z.type = 'pantry'
+        return z
+
     @staticmethod
     def create_prep_zone(ideal=90) -> 'Zone':
         # Elastic. Min 30, Max 120?
@@ -32,5 +32,22 @@ class TestGenerator(unittest.TestCase):
         # Check if vertices created
         self.assertTrue(len(gen.vertices) > 8)
 
+    def test_non_quad_faces_keep_their_order(self):
+        gen = OBJGenerator()
+        for i in range(5):
+            gen.add_vertex(i, 0, 0)
+        gen.add_face([1, 2, 3, 4])
+        gen.add_face([1, 2, 3])
+        gen.add_face([1, 2, 3, 4, 5])
+        gen.add_face([2, 3, 4, 5])
+        
+        filename = "test_polygons.obj"
+        gen.save(filename)
+        with open(filename, 'r') as f:
+            face_lines = [line.strip() for line in f if line.startswith('f ')]
+        os.remove(filename)
+        
+        self.assertEqual(face_lines, ["f 1 2 3 4", "f 1 2 3", "f 1 2 3 4 5", "f 2 3 4 5"])
+
 if __name__ == '__main__':
     unittest.main()
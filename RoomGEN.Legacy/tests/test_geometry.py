@@ -1,5 +1,5 @@
 import unittest
-from kitchen_core.geometry import Room, Slope
+from kitchen_core.geometry import Room, Slope, rect_clip_aabb
 
 class TestGeometry(unittest.TestCase):
     def test_flat_room(self):
@@ -54,5 +54,40 @@ class TestGeometry(unittest.TestCase):
         intervals = room.get_valid_x_intervals(60, 300)
         self.assertEqual(len(intervals), 0)
 
+    def test_valid_intervals_are_memoized(self):
+        room = Room(400, 300, 260, [Slope('left', 120, 45)], {})
+        first = room.get_valid_x_intervals(60, 200)
+        first.clear()  # Callers get a copy - the cache stays intact
+        self.assertEqual(room.get_valid_x_intervals(60, 200), [(80, 340)])
+
+    def test_ceiling_height_array_matches_scalar(self):
+        room = Room(400, 300, 260, [Slope('left', 120, 45), Slope('back', 200, 30)], {})
+        xs = [0, 50, 100, 250, 399]
+        heights = room.get_ceiling_height_array(xs, 50)
+        for x, h in zip(xs, heights):
+            self.assertAlmostEqual(h, room.get_ceiling_height(x, 50))
+
+    def test_rect_clip_no_overlap(self):
+        rect = (0, 0, 100, 50)
+        self.assertEqual(rect_clip_aabb(rect, (200, 0, 10, 10)), [rect])
+
+    def test_rect_clip_window(self):
+        # Wall 400x260 with a window 100..220 x 100..220
+        pieces = rect_clip_aabb((0, 0, 400, 260), (100, 100, 120, 120))
+        self.assertEqual(pieces, [
+            (0, 0, 100, 260),      # Left
+            (220, 0, 180, 260),    # Right
+            (100, 0, 120, 100),    # Below (sill)
+            (100, 220, 120, 40),   # Above (lintel)
+        ])
+        # Pieces cover the wall minus the hole exactly
+        area = sum(w * h for _, _, w, h in pieces)
+        self.assertEqual(area, 400 * 260 - 120 * 120)
+
+    def test_rect_clip_door_at_edge(self):
+        # Door from the floor at the left edge leaves Right + Top only
+        pieces = rect_clip_aabb((0, 0, 400, 260), (0, 0, 90, 200))
+        self.assertEqual(pieces, [(90, 0, 310, 260), (0, 200, 90, 60)])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,38 @@
+import unittest
+import math
+from kitchen_core.ghost_chef import GhostChef
+
+class TestGhostChef(unittest.TestCase):
+    def _skeleton(self, volumes):
+        return {'volumes': [
+            {'x': x, 'width': w, 'function': f, 'metadata': {}} for x, w, f in volumes
+        ]}
+
+    def test_picks_closest_zone(self):
+        # Two prep zones, only 'serving' and 'prep' matter for this routine
+        chef = GhostChef()
+        chef.workflows = {'grab': ['prep']}
+        skeleton = self._skeleton([(0, 60, 'prep'), (170, 60, 'prep')])
+
+        # Entry at (200, 0, 150). Closest prep center is (200, 0, 60) -> 90
+        cost = chef.evaluate_skeleton(skeleton, 400)
+        self.assertAlmostEqual(cost, 90.0)
+
+    def test_pantry_falls_back_to_fridge(self):
+        chef = GhostChef()
+        chef.workflows = {'snack': ['pantry', 'serving']}
+        skeleton = self._skeleton([(0, 60, 'fridge')])
+
+        # Entry (200, 0, 150) -> fridge (30, 0, 60) -> back to entry
+        leg = math.sqrt(170**2 + 90**2)
+        cost = chef.evaluate_skeleton(skeleton, 400)
+        self.assertAlmostEqual(cost, 2 * leg)
+
+    def test_missing_zone_stays_put(self):
+        chef = GhostChef()
+        chef.workflows = {'wash': ['wet']}
+        cost = chef.evaluate_skeleton(self._skeleton([(0, 60, 'fridge')]), 400)
+        self.assertEqual(cost, 0.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+from kitchen_core.layers import LayerSchema
+from kitchen_core.slices import SliceComposer
+
+class TestSliceComposer(unittest.TestCase):
+    def test_fill_prefers_large_tiles(self):
+        seq = SliceComposer(300, LayerSchema.equal_3_drawer()).compose()
+        self.assertEqual([t.width for t in seq.tiles], [80, 80, 80, 60])
+        self.assertEqual(seq.total_width, 300)
+
+    def test_remainder_becomes_filler(self):
+        seq = SliceComposer(187, LayerSchema.equal_3_drawer()).compose()
+        widths = [t.width for t in seq.tiles]
+        self.assertEqual(widths, [80, 80, 20, 7])
+        self.assertEqual(seq.tiles[-1].function, 'filler')
+
+    def test_fractional_target_width(self):
+        seq = SliceComposer(187.5, LayerSchema.equal_3_drawer()).compose()
+        self.assertEqual([t.width for t in seq.tiles], [80, 80, 20, 7.5])
+        self.assertEqual(seq.total_width, 187.5)
+
+    def test_tiny_remainder_is_dropped(self):
+        seq = SliceComposer(83, LayerSchema.equal_3_drawer()).compose()
+        self.assertEqual([t.width for t in seq.tiles], [80])
+
+    def test_required_appliance_needs_matching_seams(self):
+        # Dishwasher housing is a full door - incompatible with drawer seams
+        self.assertIsNone(SliceComposer(120, LayerSchema.equal_3_drawer()).compose(['appliance']))
+
+        seq = SliceComposer(120, LayerSchema.full_door(85)).compose(['appliance'])
+        self.assertEqual([(t.width, t.function) for t in seq.tiles], [(60, 'appliance'), (60, 'storage')])
+
+    def test_overcommitted_required_functions_abort(self):
+        schema = LayerSchema.full_door(85)
+        self.assertIsNone(SliceComposer(100, schema).compose(['appliance', 'appliance']))
+        self.assertIsNotNone(SliceComposer(120, schema).compose(['appliance', 'appliance']))
+
+    def test_tiles_are_shared_across_composers(self):
+        a = SliceComposer(187, LayerSchema.equal_3_drawer()).compose()
+        b = SliceComposer(187, LayerSchema.equal_3_drawer()).compose()
+        self.assertTrue(all(x is y for x, y in zip(a.tiles, b.tiles)))
+
+if __name__ == '__main__':
+    unittest.main()
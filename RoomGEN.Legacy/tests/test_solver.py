@@ -1,11 +1,25 @@
+import os
+import tempfile
 import unittest
 from kitchen_core.geometry import Room, Slope
+from ortools.sat.python import cp_model
 from kitchen_core.solver import KitchenSolver
+from kitchen_core.zones import ZoneFactory
 
 class TestSolver(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Solvers never mutate the room - share the rooms (and their memoized
+        # clearance intervals) across tests
+        cls.room = Room(400, 300, 260, [], [])
+        cls.water_room = Room(400, 300, 260, [], {'water_x': 100})
+        cls.low_slope_room = Room(400, 300, 260, [Slope('left', 50, 0)], {})  # height 50 everywhere
+        cls.window_room = Room(400, 300, 260, [], [],
+                               windows=[{'wall': 'back', 'x': 0, 'width': 80, 'y': 90}])
+
     def test_simple_layout(self):
         # Room 400x300x260, water at 100
-        room = Room(400, 300, 260, [], {'water_x': 100})
+        room = self.water_room
         solver = KitchenSolver(room)
         
         wishlist = [
@@ -56,8 +70,7 @@ class TestSolver(unittest.TestCase):
     def test_height_constraint_fail(self):
         # Slope very low. Fridge 200cm.
         # Slope starts at 0, angle 0 => height 0 (impossible room)
-        slope = Slope('left', 50, 0) # height 50 everywhere
-        room = Room(400, 300, 260, [slope], {})
+        room = self.low_slope_room
         
         # Fridge needs 200
         wishlist = [{'type': 'fridge', 'width': 60, 'height': 200}]
@@ -66,5 +79,145 @@ class TestSolver(unittest.TestCase):
         result = solver.solve(wishlist)
         self.assertIsNone(result)
 
+    def test_fridge_fits_between_slopes_at_min_width(self):
+        # Clear stretch 65..127: a 60cm fridge fits, any wider one does not
+        room = Room(192, 300, 260, [Slope('left', 150, 45), Slope('right', 150, 45)], [])
+        self.assertEqual(room.get_valid_x_intervals(60, 215), [(65, 67)])
+        
+        result = KitchenSolver(room).solve([{'type': 'fridge', 'width': 60, 'height': 215}])
+        self.assertIsNotNone(result)
+        [fridge] = result['volumes']
+        self.assertGreaterEqual(fridge['x'], 65)
+        self.assertLessEqual(fridge['x'] + fridge['width'], 127)
+
+    def test_identical_zones_are_not_permuted(self):
+        room = self.room
+        solver = KitchenSolver(room)
+        
+        # Two identical prep zones - swapping them is not a new layout
+        wishlist = [
+            {'type': 'base_cabinet', 'width': 60},
+            {'type': 'base_cabinet', 'width': 60}
+        ]
+        
+        for skeleton in solver.solve_scenarios(wishlist, [], limit=10):
+            first, second = skeleton['volumes']
+            self.assertLessEqual(first['x'] + first['width'], second['x'])
+
+    def test_closed_form_score_matches_cp(self):
+        room = self.room
+        solver = KitchenSolver(room)
+        zones = [
+            ZoneFactory.create_wet_zone(60, 60),
+            ZoneFactory.create_cooking_zone(60),
+            ZoneFactory.create_fridge_zone(60, 200),
+            ZoneFactory.create_prep_zone(120),
+        ]
+        
+        model, _, objective = solver._build_zone_model(zones, room.width)
+        model.Minimize(objective)
+        cp = cp_model.CpSolver()
+        cp.Solve(model)
+        self.assertEqual(solver._closed_form_best_score(zones, room.width), cp.Value(objective))
+
+    def test_cached_zone_model_gives_same_scenarios(self):
+        room = self.room
+        solver = KitchenSolver(room)
+        wishlist = [
+            {'type': 'sink_cabinet', 'width': 60},
+            {'type': 'stove_cabinet', 'width': 60},
+            {'type': 'base_cabinet', 'width': 60}
+        ]
+        
+        first = solver.solve_scenarios(wishlist, [], limit=5)
+        second = solver.solve_scenarios(wishlist, [], limit=5)
+        self.assertEqual(len(solver._model_cache), 1)
+        self.assertGreater(len(first), 1)
+        self.assertEqual(first, second)
+
+    def test_fast_mode_keeps_scenarios(self):
+        # Back-wall window forces the CP-SAT optimum search (no closed form)
+        room = self.window_room
+        wishlist = [
+            {'type': 'fridge', 'width': 60, 'height': 200},
+            {'type': 'sink_cabinet', 'width': 60},
+            {'type': 'stove_cabinet', 'width': 60}
+        ]
+        
+        fast = KitchenSolver(room).solve_scenarios(wishlist, [], limit=5)
+        full = KitchenSolver(room).solve_scenarios(wishlist, [], limit=5, fast_mode=False)
+        self.assertGreater(len(fast), 1)
+        self.assertEqual(fast, full)
+
+    def test_single_scenario_is_optimal_layout(self):
+        room = self.room
+        solver = KitchenSolver(room)
+        wishlist = [
+            {'type': 'sink_cabinet', 'width': 60},
+            {'type': 'fridge', 'width': 60, 'height': 200},
+            {'type': 'stove_cabinet', 'width': 60}
+        ]
+        
+        [skeleton] = solver.solve_scenarios(wishlist, [], limit=1)
+        fridge = next(v for v in skeleton['volumes'] if v['function'] == 'fridge')
+        self.assertIn(fridge['x'], (0, room.width - fridge['width']))
+
+    def test_rigid_zones_in_range_are_packed_from_start(self):
+        room = self.room
+        solver = KitchenSolver(room)
+        zones = [ZoneFactory.create_wet_zone(60, 60), ZoneFactory.create_cooking_zone(60)]
+        
+        skeleton = solver._solve_zones_in_range(zones, 100, 400, [])
+        self.assertEqual([(v['x'], v['width']) for v in skeleton['volumes']], [(100, 120), (220, 60)])
+        self.assertIsNone(solver._solve_zones_in_range(zones, 100, 250, []))
+
+    def test_solution_cache_round_trip(self):
+        room = self.room
+        wishlist = [
+            {'type': 'sink_cabinet', 'width': 60},
+            {'type': 'base_cabinet', 'width': 60}
+        ]
+        
+        with tempfile.TemporaryDirectory() as cache_dir:
+            first = KitchenSolver(room, cache_dir=cache_dir).solve(wishlist)
+            self.assertEqual(len(os.listdir(cache_dir)), 1)
+            # A fresh solver picks the stored skeleton up from disk
+            second = KitchenSolver(room, cache_dir=cache_dir).solve(wishlist)
+            self.assertEqual(first, second)
+            
+            # A new cache version never serves skeletons stored by an older one
+            newer = KitchenSolver(room, cache_dir=cache_dir)
+            newer.SOLUTION_CACHE_VERSION += 1
+            newer.solve(wishlist)
+            self.assertEqual(len(os.listdir(cache_dir)), 2)
+
+    def test_in_memory_cache_returns_independent_copies(self):
+        room = self.room
+        solver = KitchenSolver(room, cache=True)
+        wishlist = [{'type': 'sink_cabinet', 'width': 60}]
+        
+        first = solver.solve(wishlist)
+        first['volumes'].clear()
+        self.assertTrue(solver.solve(wishlist)['volumes'])
+        
+        solver.clear_cache()
+        self.assertEqual(solver._solution_cache, {})
+
+    def test_unsatisfiable_wishlists_are_rejected_upfront(self):
+        solver = KitchenSolver(self.room)
+        # Prep zones shrink to 40cm: 9 x 40 + 60 sink > 400
+        too_wide = [{'type': 'base_cabinet', 'width': 60}] * 9 + [{'type': 'sink_cabinet', 'width': 60}]
+        self.assertEqual(solver.solve_scenarios(too_wide, []), [])
+        too_tall = [{'type': 'fridge', 'width': 60, 'height': 270}]
+        self.assertEqual(solver.solve_scenarios(too_tall, []), [])
+
+    def test_caller_wishlist_is_not_mutated(self):
+        # A type string built at runtime is not interned - it must come back as the same object
+        sink_type = ''.join(['sink', '_cabinet'])
+        item = {'type': sink_type, 'width': 60}
+        KitchenSolver(self.room).solve_scenarios([item], [], limit=1)
+        self.assertIs(item['type'], sink_type)
+        self.assertEqual(item, {'type': 'sink_cabinet', 'width': 60})
+
 if __name__ == '__main__':
     unittest.main()